@@ -0,0 +1,99 @@
+import csv
+import io
+import tempfile
+
+import xlsxwriter
+from werkzeug.exceptions import NotFound
+
+from odoo import api, http
+from odoo.http import content_disposition, request
+
+EXPORT_WIZARDS = (
+    'account.report.general.ledger',
+    'account.report.partner.ledger',
+    'account.balance.report',
+)
+# Rows written between two chunks sent to the client
+EXPORT_CHUNK_ROWS = 1000
+EXPORT_CHUNK_SIZE = 64 * 1024
+XLSX_MAX_ROWS = 1048576
+
+
+def _csv_chunks(columns, rows):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for index, row in enumerate(rows, 1):
+        writer.writerow(row)
+        if not index % EXPORT_CHUNK_ROWS:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue().encode()
+
+
+def _xlsx_chunks(columns, rows):
+    """ Write the rows in constant memory mode, which flushes each row to a
+    temporary file as soon as the next one starts, then stream the workbook.
+    Sheets are continued on a new one once full. """
+    with tempfile.TemporaryFile() as output:
+        workbook = xlsxwriter.Workbook(output, {
+            'constant_memory': True,
+            'default_date_format': 'yyyy-mm-dd',
+        })
+        bold = workbook.add_format({'bold': True})
+        worksheet = row_index = None
+        for row in rows:
+            if worksheet is None or row_index == XLSX_MAX_ROWS:
+                worksheet = workbook.add_worksheet()
+                worksheet.write_row(0, 0, columns, bold)
+                row_index = 1
+            worksheet.write_row(row_index, 0, row)
+            row_index += 1
+        if worksheet is None:
+            workbook.add_worksheet().write_row(0, 0, columns, bold)
+        workbook.close()
+        output.seek(0)
+        while chunk := output.read(EXPORT_CHUNK_SIZE):
+            yield chunk
+
+
+EXPORT_FORMATS = {
+    'csv': ('text/csv;charset=utf-8', _csv_chunks),
+    'xlsx': ('application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', _xlsx_chunks),
+}
+
+
+class LedgerExportController(http.Controller):
+
+    @http.route('/accounting_pdf_reports/export/<string:model>/<int:wizard_id>/<string:file_format>',
+                type='http', auth='user')
+    def export_report(self, model, wizard_id, file_format, active_model='ir.ui.menu', active_ids='', **kwargs):
+        """ Stream the report of the wizard to a CSV or XLSX file. The rows
+        are produced while the response is sent, from a cursor of their own
+        since the one of the request is closed by then. """
+        if model not in EXPORT_WIZARDS or file_format not in EXPORT_FORMATS:
+            raise NotFound()
+        wizard = request.env[model].browse(wizard_id).exists()
+        if not wizard:
+            raise NotFound()
+        wizard = wizard.with_context(
+            active_model=active_model,
+            active_ids=[int(record_id) for record_id in active_ids.split(',') if record_id])
+        report_name, data = wizard._get_export_data()
+        report = request.env[report_name]
+        columns = report._get_export_columns(data)
+        registry, uid, context = request.env.registry, request.env.uid, dict(request.env.context)
+
+        def rows():
+            with registry.cursor() as cr:
+                env = api.Environment(cr, uid, context)
+                yield from env[report_name]._get_export_rows(data)
+
+        mimetype, write_chunks = EXPORT_FORMATS[file_format]
+        response = request.make_response(write_chunks(columns, rows()), headers=[
+            ('Content-Type', mimetype),
+            ('Content-Disposition', content_disposition('%s.%s' % (report._description, file_format))),
+        ])
+        response.direct_passthrough = True
+        return response
@@ -1,3 +1,4 @@
 from . import account_account_type
 from . import account_financial_report
+from . import account_move
 from . import account_move_line
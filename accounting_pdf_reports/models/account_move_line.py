@@ -1,6 +1,11 @@
 import ast
+import uuid
+
 from odoo import api, models, fields
 
+# Number of rows fetched at once by the server-side cursors of the exports
+STREAM_ITERSIZE = 2000
+
 
 class AccountMoveLine(models.Model):
     _inherit = "account.move.line"
@@ -75,3 +80,16 @@ class AccountMoveLine(models.Model):
             where_string, where_params = query.where_clause
             tables, where_clause, where_clause_params = from_string, where_string, from_params + where_params
         return tables, where_clause, where_clause_params
+
+    @api.model
+    def _stream_query(self, query, params, itersize=STREAM_ITERSIZE):
+        """ Execute the query with a server-side cursor and yield its rows,
+        fetching them by batches of itersize so that memory use does not
+        depend on the size of the result """
+        cursor = self.env.cr._cnx.cursor(name='accounting_report_%s' % uuid.uuid4().hex)
+        cursor.itersize = itersize
+        try:
+            cursor.execute(query, params)
+            yield from cursor
+        finally:
+            cursor.close()
@@ -1,83 +1,124 @@
 import time
-from odoo import api, models, _
+from odoo import api, models, tools, _
 from odoo.exceptions import UserError
 
+BALANCE_COLUMNS = {
+    'debit': "COALESCE(SUM(debit), 0)",
+    'credit': "COALESCE(SUM(credit), 0)",
+    'balance': "COALESCE(SUM(debit), 0) - COALESCE(SUM(credit), 0)",
+}
+# Recordsets of the context filtering the move lines in _query_get
+BALANCE_RECORDSET_FILTERS = (
+    'account_tag_ids', 'account_ids', 'analytic_tag_ids',
+    'analytic_account_ids', 'partner_ids', 'partner_categories',
+)
+
 
 class ReportFinancial(models.AbstractModel):
     _name = 'report.accounting_pdf_reports.report_financial'
     _description = 'Financial Reports'
 
-    def _compute_account_balance(self, accounts):
+    def _get_balance_cache_key(self):
+        """ Return the values of the context the account balances depend on,
+        or None when they must not be cached: balances of draft entries
+        change without any posting, and reconciliations do not change the
+        entries fingerprint """
+        context = self.env.context
+        state = context.get('state')
+        if not state or state.lower() != 'posted' or context.get('reconcile_date'):
+            return None
+        return (
+            self.env.uid, self.env.su, tuple(self.env.companies.ids),
+            context.get('company_id'), str(context.get('date_from')),
+            str(context.get('date_to')), bool(context.get('strict_range')),
+            bool(context.get('initial_bal')), bool(context.get('aged_balance')),
+            tuple(context.get('journal_ids') or ()),
+        ) + tuple(
+            tuple(context[name].ids) if context.get(name) else ()
+            for name in BALANCE_RECORDSET_FILTERS
+        )
+
+    def _query_account_balances(self):
+        """ Return the debit, credit and balance of every account for the
+        context options, computed with a single grouped query """
+        tables, where_clause, where_params = self.env['account.move.line']._query_get()
+        tables = tables.replace('"', '') if tables else "account_move_line"
+        request = "SELECT account_id, " + ', '.join(BALANCE_COLUMNS.values()) + \
+                  " FROM " + tables + \
+                  " WHERE " + (where_clause.strip() or "TRUE") + \
+                  " GROUP BY account_id"
+        self.env.cr.execute(request, where_params)
+        return {row[0]: row[1:] for row in self.env.cr.fetchall()}
+
+    @tools.ormcache('version', 'key')
+    def _get_cached_account_balances(self, version, key):
+        return self._query_account_balances()
+
+    def _get_account_balances(self):
+        """ Return the balances of all accounts, cached per user, company
+        and filters for posted entries until the journal entries change """
+        key = self._get_balance_cache_key()
+        if key is None:
+            return self._query_account_balances()
+        version = self.env['account.move']._get_report_balance_version()
+        return self._get_cached_account_balances(version, key)
+
+    def _compute_account_balance(self, accounts, balances=None):
         """ compute the balance, debit and credit for the provided accounts
         """
-        mapping = {
-            'balance': "COALESCE(SUM(debit),0) - COALESCE(SUM(credit), 0) as balance",
-            'debit': "COALESCE(SUM(debit), 0) as debit",
-            'credit': "COALESCE(SUM(credit), 0) as credit",
-        }
-
+        if balances is None:
+            balances = self._get_account_balances()
         res = {}
-        for account in accounts:
-            res[account.id] = dict.fromkeys(mapping, 0.0)
-        if accounts:
-            tables, where_clause, where_params = self.env['account.move.line']._query_get()
-            tables = tables.replace('"', '') if tables else "account_move_line"
-            wheres = [""]
-            if where_clause.strip():
-                wheres.append(where_clause.strip())
-            filters = " AND ".join(wheres)
-            request = "SELECT account_id as id, " + ', '.join(mapping.values()) + \
-                       " FROM " + tables + \
-                       " WHERE account_id IN %s " \
-                            + filters + \
-                       " GROUP BY account_id"
-            params = (tuple(accounts._ids),) + tuple(where_params)
-            self.env.cr.execute(request, params)
-            for row in self.env.cr.dictfetchall():
-                res[row['id']] = row
+        for account_id in accounts.ids:
+            res[account_id] = dict(zip(
+                BALANCE_COLUMNS, balances.get(account_id, (0.0, 0.0, 0.0))))
         return res
 
     def _compute_report_balance(self, reports):
         '''returns a dictionary with key=the ID of a record and value=the credit, debit and balance amount
-           computed for this record. If the record is of type :
-               'accounts' : it's the sum of the linked accounts
-               'account_type' : it's the sum of leaf accoutns with such an account_type
-               'account_report' : it's the amount of the related report
-               'sum' : it's the sum of the children of this record (aka a 'view' record)'''
-        res = {}
-        fields = ['credit', 'debit', 'balance']
-        for report in reports:
-            if report.id in res:
-                continue
-            res[report.id] = dict((fn, 0.0) for fn in fields)
-            if report.type == 'accounts':
-                # it's the sum of the linked accounts
-                res[report.id]['account'] = self._compute_account_balance(report.account_ids)
-                for value in res[report.id]['account'].values():
-                    for field in fields:
-                        res[report.id][field] += value.get(field)
-            elif report.type == 'account_type':
-                # it's the sum the leaf accounts with such an account type
-                accounts = self.env['account.account'].search(
-                    [('account_type', 'in', report.account_type_ids.mapped('type'))])
-
-                res[report.id]['account'] = self._compute_account_balance(accounts)
-                for value in res[report.id]['account'].values():
-                    for field in fields:
-                        res[report.id][field] += value.get(field)
+           computed for this record. If the record is of type :
+               'accounts' : it's the sum of the linked accounts
+               'account_type' : it's the sum of leaf accoutns with such an account_type
+               'account_report' : it's the amount of the related report
+               'sum' : it's the sum of the children of this record (aka a 'view' record)
+           The account balances are read once and rolled up the report tree in memory.'''
+        balances = self._get_account_balances()
+        accounts_by_type = {
+            account_type: accounts
+            for account_type, accounts in self.env['account.account']._read_group(
+                [], ['account_type'], ['id:recordset'])
+        }
+        computed = {}
+
+        def compute(report):
+            if report.id in computed:
+                return computed[report.id]
+            values = computed[report.id] = dict.fromkeys(BALANCE_COLUMNS, 0.0)
+            if report.type in ('accounts', 'account_type'):
+                if report.type == 'accounts':
+                    # it's the sum of the linked accounts
+                    accounts = report.account_ids
+                else:
+                    # it's the sum the leaf accounts with such an account type
+                    accounts = self.env['account.account'].union(*(
+                        accounts_by_type.get(account_type.type, self.env['account.account'])
+                        for account_type in report.account_type_ids))
+                values['account'] = self._compute_account_balance(accounts, balances)
+                children_values = values['account'].values()
             elif report.type == 'account_report' and report.account_report_id:
                 # it's the amount of the linked report
-                res2 = self._compute_report_balance(report.account_report_id)
-                for key, value in res2.items():
-                    for field in fields:
-                        res[report.id][field] += value[field]
+                children_values = [compute(report.account_report_id)]
             elif report.type == 'sum':
                 # it's the sum of the children of this account.report
-                res2 = self._compute_report_balance(report.children_ids)
-                for key, value in res2.items():
-                    for field in fields:
-                        res[report.id][field] += value[field]
-        return res
+                children_values = [compute(child) for child in report.children_ids]
+            else:
+                children_values = []
+            for value in children_values:
+                for field in BALANCE_COLUMNS:
+                    values[field] += value[field]
+            return values
+
+        return {report.id: compute(report) for report in reports}
 
     def get_account_lines(self, data):
         lines = []
@@ -7,6 +7,26 @@ class ReportGeneralLedger(models.AbstractModel):
     _name = 'report.accounting_pdf_reports.report_general_ledger'
     _description = 'General Ledger Report'
 
+    def _get_move_line_filters(self, analytic_account_ids, partner_ids,
+                               initial_balance=False):
+        """ Return the SQL filters and their parameters selecting the move
+        lines of the report, aliasing move lines as l and moves as m """
+        context = dict(self.env.context)
+        if initial_balance:
+            context['date_to'] = False
+            context['initial_bal'] = True
+        if analytic_account_ids:
+            context['analytic_account_ids'] = analytic_account_ids
+        if partner_ids:
+            context['partner_ids'] = partner_ids
+        tables, where_clause, where_params = self.env['account.move.line'].with_context(context)._query_get()
+        wheres = [""]
+        if where_clause.strip():
+            wheres.append(where_clause.strip())
+        filters = " AND ".join(wheres)
+        filters = filters.replace('account_move_line__move_id', 'm').replace('account_move_line', 'l')
+        return filters, where_params
+
     def _get_account_move_entry(self, accounts, analytic_account_ids,
                                 partner_ids, init_balance,
                                 sortby, display_account):
@@ -29,25 +49,12 @@ class ReportGeneralLedger(models.AbstractModel):
         }
         """
         cr = self.env.cr
-        MoveLine = self.env['account.move.line']
         move_lines = {x: [] for x in accounts.ids}
 
         # Prepare initial sql query and Get the initial move lines
         if init_balance:
-            context = dict(self.env.context)
-            context['date_from'] = self.env.context.get('date_from')
-            context['date_to'] = False
-            context['initial_bal'] = True
-            if analytic_account_ids:
-                context['analytic_account_ids'] = analytic_account_ids
-            if partner_ids:
-                context['partner_ids'] = partner_ids
-            init_tables, init_where_clause, init_where_params = MoveLine.with_context(context)._query_get()
-            init_wheres = [""]
-            if init_where_clause.strip():
-                init_wheres.append(init_where_clause.strip())
-            init_filters = " AND ".join(init_wheres)
-            filters = init_filters.replace('account_move_line__move_id', 'm').replace('account_move_line', 'l')
+            filters, init_where_params = self._get_move_line_filters(
+                analytic_account_ids, partner_ids, initial_balance=True)
             sql = ("""SELECT 0 AS lid, l.account_id AS account_id, '' AS ldate,
                 '' AS lcode, 0.0 AS amount_currency, 
                 '' AS analytic_account_id, '' AS lref, 
@@ -75,17 +82,8 @@ class ReportGeneralLedger(models.AbstractModel):
             sql_sort = 'j.code, p.name, l.move_id'
 
         # Prepare sql query base on selected parameters from wizard
-        context = dict(self.env.context)
-        if analytic_account_ids:
-            context['analytic_account_ids'] = analytic_account_ids
-        if partner_ids:
-            context['partner_ids'] = partner_ids
-        tables, where_clause, where_params = MoveLine.with_context(context)._query_get()
-        wheres = [""]
-        if where_clause.strip():
-            wheres.append(where_clause.strip())
-        filters = " AND ".join(wheres)
-        filters = filters.replace('account_move_line__move_id', 'm').replace('account_move_line', 'l')
+        filters, where_params = self._get_move_line_filters(
+            analytic_account_ids, partner_ids)
 
         # Get move lines base on sql query and Calculate the total balance of move lines
         sql = ('''SELECT l.id AS lid, l.account_id AS account_id, 
@@ -141,14 +139,35 @@ class ReportGeneralLedger(models.AbstractModel):
             raise UserError(_("Form content is missing, this report cannot be printed."))
         model = self.env.context.get('active_model')
         docs = self.env[model].browse(self.env.context.get('active_ids', []))
-        init_balance = data['form'].get('initial_balance', True)
-        sortby = data['form'].get('sortby', 'sort_date')
-        display_account = data['form']['display_account']
+        options = self._get_report_options(data, model, docs)
         codes = []
         if data['form'].get('journal_ids', False):
             codes = [journal.code for journal in
                      self.env['account.journal'].search(
                          [('id', 'in', data['form']['journal_ids'])])]
+        accounts_res = self.with_context(
+            data['form'].get('used_context', {}))._get_account_move_entry(
+            options['accounts'],
+            options['analytic_account_ids'],
+            options['partner_ids'],
+            options['init_balance'], options['sortby'],
+            options['display_account'])
+        return {
+            'doc_ids': docids,
+            'doc_model': model,
+            'data': data['form'],
+            'docs': docs,
+            'time': time,
+            'Accounts': accounts_res,
+            'print_journal': codes,
+            'accounts': options['accounts'],
+            'partner_ids': options['partner_ids'],
+            'analytic_account_ids': options['analytic_account_ids'],
+        }
+
+    def _get_report_options(self, data, model, docs):
+        """ Return the accounts, analytic accounts, partners and display
+        options selected in the wizard """
         analytic_account_ids = False
         if data['form'].get('analytic_account_ids', False):
             analytic_account_ids = self.env['account.analytic.account'].search(
@@ -164,21 +183,107 @@ class ReportGeneralLedger(models.AbstractModel):
             if data['form'].get('account_ids', False):
                 domain.append(('id', 'in', data['form']['account_ids']))
             accounts = self.env['account.account'].search(domain)
-        accounts_res = self.with_context(
-            data['form'].get('used_context', {}))._get_account_move_entry(
-            accounts,
-            analytic_account_ids,
-            partner_ids,
-            init_balance, sortby, display_account)
         return {
-            'doc_ids': docids,
-            'doc_model': model,
-            'data': data['form'],
-            'docs': docs,
-            'time': time,
-            'Accounts': accounts_res,
-            'print_journal': codes,
             'accounts': accounts,
-            'partner_ids': partner_ids,
             'analytic_account_ids': analytic_account_ids,
+            'partner_ids': partner_ids,
+            'init_balance': data['form'].get('initial_balance', True),
+            'sortby': data['form'].get('sortby', 'sort_date'),
+            'display_account': data['form']['display_account'],
         }
+
+    def _get_export_columns(self, data):
+        return [_('Account'), _('Account Name'), _('Date'), _('JRNL'),
+                _('Partner'), _('Ref'), _('Move'), _('Entry Label'),
+                _('Debit'), _('Credit'), _('Balance'), _('Currency Amount'),
+                _('Currency')]
+
+    def _get_export_rows(self, data):
+        """ Yield the rows of the ledger for the CSV and XLSX exports: a row
+        with the totals of each account, its initial balance and its move
+        lines with their progressive balance. Move lines are read with a
+        server-side cursor, only the per-account totals are kept in memory """
+        model = data['model']
+        docs = self.env[model].browse(data.get('ids', []))
+        options = self._get_report_options(data, model, docs)
+        return self.with_context(
+            data['form'].get('used_context', {}))._iter_export_rows(options)
+
+    def _iter_export_rows(self, options):
+        accounts = options['accounts']
+        if not accounts:
+            return
+        totals_sql = """SELECT l.account_id, COALESCE(SUM(l.debit), 0.0),
+            COALESCE(SUM(l.credit), 0.0)
+            FROM account_move_line l
+            JOIN account_move m ON (l.move_id=m.id)
+            LEFT JOIN res_currency c ON (l.currency_id=c.id)
+            LEFT JOIN res_partner p ON (l.partner_id=p.id)
+            JOIN account_journal j ON (l.journal_id=j.id)
+            WHERE l.account_id IN %s"""
+        initial = {}
+        if options['init_balance']:
+            filters, params = self._get_move_line_filters(
+                options['analytic_account_ids'], options['partner_ids'],
+                initial_balance=True)
+            self.env.cr.execute(totals_sql + filters + " GROUP BY l.account_id",
+                                (tuple(accounts.ids),) + tuple(params))
+            initial = {row[0]: row[1:] for row in self.env.cr.fetchall()}
+        filters, where_params = self._get_move_line_filters(
+            options['analytic_account_ids'], options['partner_ids'])
+        self.env.cr.execute(totals_sql + filters + " GROUP BY l.account_id",
+                            (tuple(accounts.ids),) + tuple(where_params))
+        totals = {row[0]: row[1:] for row in self.env.cr.fetchall()}
+
+        selected = []
+        for account in accounts:
+            currency = account.currency_id or self.env.company.currency_id
+            init_debit, init_credit = initial.get(account.id, (0.0, 0.0))
+            debit, credit = totals.get(account.id, (0.0, 0.0))
+            debit, credit = init_debit + debit, init_credit + credit
+            if options['display_account'] == 'movement' and not (
+                    account.id in initial or account.id in totals):
+                continue
+            if options['display_account'] == 'not_zero' and currency.is_zero(debit - credit):
+                continue
+            selected.append((account, debit, credit))
+        if not selected:
+            return
+
+        sql_sort = 'l.date, l.move_id'
+        if options['sortby'] == 'sort_journal_partner':
+            sql_sort = 'j.code, p.name, l.move_id'
+        selected_ids = [account.id for account, debit, credit in selected]
+        sql = ("""SELECT l.account_id, l.date, j.code, p.name, l.ref, m.name,
+            l.name, COALESCE(l.debit, 0), COALESCE(l.credit, 0),
+            l.amount_currency, c.symbol
+            FROM account_move_line l
+            JOIN account_move m ON (l.move_id=m.id)
+            LEFT JOIN res_currency c ON (l.currency_id=c.id)
+            LEFT JOIN res_partner p ON (l.partner_id=p.id)
+            JOIN account_journal j ON (l.journal_id=j.id)
+            WHERE l.account_id IN %s""" + filters + """
+            ORDER BY array_position(%s, l.account_id), """ + sql_sort + """, l.id""")
+        params = (tuple(selected_ids),) + tuple(where_params) + (selected_ids,)
+
+        def account_rows(account, debit, credit):
+            yield (account.code, account.name, None, None, None, None, None,
+                   None, debit, credit, debit - credit, None, None)
+            if account.id in initial:
+                init_debit, init_credit = initial[account.id]
+                yield (account.code, account.name, None, None, None, None,
+                       None, _('Initial Balance'), init_debit, init_credit,
+                       init_debit - init_credit, None, None)
+
+        pending = iter(selected)
+        account = None
+        for line in self.env['account.move.line']._stream_query(sql, params):
+            while account is None or line[0] != account.id:
+                account, debit, credit = next(pending)
+                init_debit, init_credit = initial.get(account.id, (0.0, 0.0))
+                balance = init_debit - init_credit
+                yield from account_rows(account, debit, credit)
+            balance += line[7] - line[8]
+            yield (account.code, account.name) + line[1:9] + (balance,) + line[9:]
+        for account, debit, credit in pending:
+            yield from account_rows(account, debit, credit)
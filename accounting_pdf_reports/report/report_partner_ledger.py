@@ -65,14 +65,10 @@ class ReportPartnerLedger(models.AbstractModel):
             result = contemp[0] or 0.0
         return result
 
-    @api.model
-    def _get_report_values(self, docids, data=None):
-        if not data.get('form'):
-            raise UserError(_("Form content is missing, this report cannot be printed."))
+    def _compute_report_data(self, data):
+        """ Store the move states and the accounts of the report in
+        data['computed'] """
         data['computed'] = {}
-
-        obj_partner = self.env['res.partner']
-        query_get_data = self.env['account.move.line'].with_context(data['form'].get('used_context', {}))._query_get()
         data['computed']['move_state'] = ['draft', 'posted']
         if data['form'].get('target_move', 'all') == 'posted':
             data['computed']['move_state'] = ['posted']
@@ -90,6 +86,16 @@ class ReportPartnerLedger(models.AbstractModel):
             WHERE a.account_type IN %s
             AND NOT a.deprecated""", (tuple(data['computed']['ACCOUNT_TYPE']),))
         data['computed']['account_ids'] = [a for (a,) in self.env.cr.fetchall()]
+        return data
+
+    @api.model
+    def _get_report_values(self, docids, data=None):
+        if not data.get('form'):
+            raise UserError(_("Form content is missing, this report cannot be printed."))
+        self._compute_report_data(data)
+
+        obj_partner = self.env['res.partner']
+        query_get_data = self.env['account.move.line'].with_context(data['form'].get('used_context', {}))._query_get()
         params = [tuple(data['computed']['move_state']), tuple(data['computed']['account_ids'])] + query_get_data[2]
         reconcile_clause = "" if data['form']['reconciled'] else ' AND "account_move_line".full_reconcile_id IS NULL '
         query = """
@@ -120,3 +126,56 @@ class ReportPartnerLedger(models.AbstractModel):
             'lines': self._lines,
             'sum_partner': self._sum_partner,
         }
+
+    def _get_export_columns(self, data):
+        columns = [_('Partner Ref'), _('Partner'), _('Date'), _('JRNL'),
+                   _('Account'), _('Ref'), _('Debit'), _('Credit'),
+                   _('Balance')]
+        if data['form']['amount_currency']:
+            columns += [_('Currency Amount'), _('Currency')]
+        return columns
+
+    def _get_export_rows(self, data):
+        """ Yield the move lines of the ledger for the CSV and XLSX exports,
+        ordered by partner with their progressive balance. Move lines are read
+        with a server-side cursor, so memory use does not depend on the size
+        of the ledger """
+        self._compute_report_data(data)
+        if not data['computed']['account_ids']:
+            return
+        query_get_data = self.env['account.move.line'].with_context(data['form'].get('used_context', {}))._query_get()
+        reconcile_clause = "" if data['form']['reconciled'] else ' AND "account_move_line".full_reconcile_id IS NULL '
+        params = [tuple(data['computed']['move_state']), tuple(data['computed']['account_ids'])]
+        partner_clause = ' AND "account_move_line".partner_id IS NOT NULL '
+        if data['form']['partner_ids']:
+            partner_clause = ' AND "account_move_line".partner_id IN %s '
+            params.append(tuple(data['form']['partner_ids']))
+        params += query_get_data[2]
+        query = """
+            SELECT "account_move_line".partner_id, p.ref, p.name, "account_move_line".date, j.code, acc.name->>'en_US', m.name, "account_move_line".ref, "account_move_line".name, "account_move_line".debit, "account_move_line".credit, "account_move_line".amount_currency, c.symbol
+            FROM """ + query_get_data[0] + """
+            LEFT JOIN account_journal j ON ("account_move_line".journal_id = j.id)
+            LEFT JOIN account_account acc ON ("account_move_line".account_id = acc.id)
+            LEFT JOIN res_currency c ON ("account_move_line".currency_id=c.id)
+            LEFT JOIN account_move m ON (m.id="account_move_line".move_id)
+            LEFT JOIN res_partner p ON (p.id="account_move_line".partner_id)
+            WHERE m.state IN %s
+                AND "account_move_line".account_id IN %s""" + partner_clause + """
+                AND """ + query_get_data[1] + reconcile_clause + """
+                ORDER BY COALESCE(p.ref, ''), COALESCE(p.name, ''), "account_move_line".partner_id, "account_move_line".date, "account_move_line".id"""
+        partner_id = progress = None
+        for (line_partner_id, ref, name, date, code, account_name, move_name,
+             line_ref, label, debit, credit, amount_currency,
+             currency_code) in self.env['account.move.line']._stream_query(query, tuple(params)):
+            if line_partner_id != partner_id:
+                partner_id, progress = line_partner_id, 0.0
+            progress += debit - credit
+            displayed_name = '-'.join(
+                value for value in (move_name, line_ref, label)
+                if value not in (None, '', '/')
+            )
+            row = (ref, name, date, code, account_name, displayed_name,
+                   debit, credit, progress)
+            if data['form']['amount_currency']:
+                row += (amount_currency, currency_code)
+            yield row
@@ -57,6 +57,12 @@ class ReportTrialBalance(models.AbstractModel):
                 account_res.append(res)
         return account_res
 
+    def _get_report_context(self, data):
+        context = data['form'].get('used_context')
+        if data['form'].get('analytic_account_ids'):
+            context['analytic_account_ids'] = self.env['account.analytic.account'].browse(data['form'].get('analytic_account_ids'))
+        return context
+
     @api.model
     def _get_report_values(self, docids, data=None):
         if not data.get('form') or not self.env.context.get('active_model'):
@@ -66,12 +72,8 @@ class ReportTrialBalance(models.AbstractModel):
         docs = self.env[model].browse(self.env.context.get('active_ids', []))
         display_account = data['form'].get('display_account')
         accounts = docs if model == 'account.account' else self.env['account.account'].search([])
-        context = data['form'].get('used_context')
-        analytic_accounts = []
-        if data['form'].get('analytic_account_ids'):
-            analytic_account_ids = self.env['account.analytic.account'].browse(data['form'].get('analytic_account_ids'))
-            context['analytic_account_ids'] = analytic_account_ids
-            analytic_accounts = [account.name for account in analytic_account_ids]
+        context = self._get_report_context(data)
+        analytic_accounts = [account.name for account in context.get('analytic_account_ids', [])]
         account_res = self.with_context(context)._get_accounts(accounts, display_account)
         codes = []
         if data['form'].get('journal_ids', False):
@@ -88,3 +90,18 @@ class ReportTrialBalance(models.AbstractModel):
             'time': time,
             'Accounts': account_res,
         }
+
+    def _get_export_columns(self, data):
+        return [_('Code'), _('Account'), _('Debit'), _('Credit'), _('Balance')]
+
+    def _get_export_rows(self, data):
+        """ Yield the accounts of the trial balance for the CSV and XLSX
+        exports. Balances are aggregated in the database, one row per
+        account """
+        model = data['model']
+        accounts = self.env[model].browse(data.get('ids', [])) if model == 'account.account' \
+            else self.env['account.account'].search([])
+        context = self._get_report_context(data)
+        for account in self.with_context(context)._get_accounts(accounts, data['form'].get('display_account')):
+            yield (account['code'], account['name'], account['debit'],
+                   account['credit'], account['balance'])
@@ -30,6 +30,10 @@ class AccountReportGeneralLedger(models.TransientModel):
         records = self.env[data['model']].browse(data.get('ids', []))
         return records, data
 
+    def _get_export_data(self):
+        records, data = self._get_report_data(self._prepare_report_data())
+        return 'report.accounting_pdf_reports.report_general_ledger', data
+
     def _print_report(self, data):
         records, data = self._get_report_data(data)
         return self.env.ref('accounting_pdf_reports.action_report_general_ledger').with_context(landscape=True).report_action(records, data=data)
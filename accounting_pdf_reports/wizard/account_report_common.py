@@ -1,3 +1,5 @@
+from urllib.parse import urlencode
+
 from odoo import api, fields, models, _
 from odoo.tools.misc import get_lang
 
@@ -41,7 +43,7 @@ class AccountCommonReport(models.TransientModel):
     def _print_report(self, data):
         raise NotImplementedError()
 
-    def check_report(self):
+    def _prepare_report_data(self):
         self.ensure_one()
         data = {}
         data['ids'] = self.env.context.get('active_ids', [])
@@ -49,4 +51,32 @@ class AccountCommonReport(models.TransientModel):
         data['form'] = self.read(['date_from', 'date_to', 'journal_ids', 'target_move', 'company_id'])[0]
         used_context = self._build_contexts(data)
         data['form']['used_context'] = dict(used_context, lang=get_lang(self.env).code)
+        return data
+
+    def check_report(self):
+        data = self._prepare_report_data()
         return self.with_context(discard_logo_check=True)._print_report(data)
+
+    def _get_export_data(self):
+        """ Return the name of the report model streaming this report to a
+        file, and the data it is called with """
+        raise NotImplementedError()
+
+    def _action_export(self, file_format):
+        self.ensure_one()
+        query = urlencode({
+            'active_model': self.env.context.get('active_model', 'ir.ui.menu'),
+            'active_ids': ','.join(map(str, self.env.context.get('active_ids', []))),
+        })
+        return {
+            'type': 'ir.actions.act_url',
+            'url': '/accounting_pdf_reports/export/%s/%s/%s?%s' % (
+                self._name, self.id, file_format, query),
+            'target': 'self',
+        }
+
+    def action_export_csv(self):
+        return self._action_export('csv')
+
+    def action_export_xlsx(self):
+        return self._action_export('xlsx')
@@ -2,3 +2,4 @@
 from . import common
 from . import test_auditlog
 from . import test_autovacuum
+from . import test_auditlog_benchmark
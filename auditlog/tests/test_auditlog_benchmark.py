@@ -0,0 +1,119 @@
+# License AGPL-3.0 or later (http://www.gnu.org/licenses/agpl).
+import logging
+import os
+import time
+from contextlib import contextmanager
+
+from odoo.tests import tagged
+
+from .common import AuditLogRuleCommon
+
+_logger = logging.getLogger(__name__)
+
+# Number of records handled by each bulk operation
+BENCHMARK_SIZE = int(os.environ.get("AUDITLOG_BENCHMARK_SIZE", "50"))
+# Allowed extra queries per record caused by the audit rule, per log type
+BENCHMARK_QUERY_BUDGET = {
+    "fast": float(os.environ.get("AUDITLOG_BENCHMARK_FAST_BUDGET", "6")),
+    "full": float(os.environ.get("AUDITLOG_BENCHMARK_FULL_BUDGET", "10")),
+}
+
+
+@tagged("post_install", "-at_install", "-standard", "auditlog_benchmark")
+class TestAuditlogBenchmark(AuditLogRuleCommon):
+    """Measure the overhead of audit rules on bulk create, write and unlink
+    of a plain model, and fail when the extra queries per record exceed
+    BENCHMARK_QUERY_BUDGET. Run it with --test-tags auditlog_benchmark.
+
+    res.partner.category stands in for a synthetic model: the module ships
+    no test model, and partner tags have no tracking, computed stored
+    fields or overrides, so the measured queries come from the audit
+    rule alone."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.model_id = cls.env.ref("base.model_res_partner_category")
+        cls.model = cls.env[cls.model_id.model].with_context(tracking_disable=True)
+
+    @contextmanager
+    def _measure(self, results, operation):
+        """Record the query count and the duration of the wrapped operation."""
+        self.env.flush_all()
+        self.env.invalidate_all()
+        queries_before = self.cr.sql_log_count
+        start = time.perf_counter()
+        yield
+        self.env.flush_all()
+        results[operation] = {
+            "queries": self.cr.sql_log_count - queries_before,
+            "duration": time.perf_counter() - start,
+        }
+
+    def _run_operations(self, label):
+        results = {}
+        with self._measure(results, "create"):
+            records = self.model.create(
+                [
+                    {"name": f"Benchmark {label} {index}", "color": index % 12}
+                    for index in range(BENCHMARK_SIZE)
+                ]
+            )
+        with self._measure(results, "write"):
+            records.write({"name": f"Benchmark {label} updated", "color": 1})
+        with self._measure(results, "unlink"):
+            records.unlink()
+        return results
+
+    def _check_overhead(self, log_type):
+        baseline = self._run_operations("baseline")
+        rule = self.create_rule(
+            {
+                "name": f"benchmark_{log_type}",
+                "model_id": self.model_id.id,
+                "log_read": False,
+                "log_create": True,
+                "log_write": True,
+                "log_unlink": True,
+                "log_type": log_type,
+            }
+        )
+        rule.subscribe()
+        try:
+            audited = self._run_operations(log_type)
+        finally:
+            rule.unsubscribe()
+
+        budget = BENCHMARK_QUERY_BUDGET[log_type]
+        for operation, measure in audited.items():
+            extra_queries = measure["queries"] - baseline[operation]["queries"]
+            per_record = extra_queries / BENCHMARK_SIZE
+            _logger.info(
+                "auditlog benchmark %s %s (%s records): %s queries (+%s), "
+                "%.2f ms/record (baseline %.2f ms/record)",
+                log_type,
+                operation,
+                BENCHMARK_SIZE,
+                measure["queries"],
+                extra_queries,
+                measure["duration"] * 1000 / BENCHMARK_SIZE,
+                baseline[operation]["duration"] * 1000 / BENCHMARK_SIZE,
+            )
+            self.assertLessEqual(
+                per_record,
+                budget,
+                f"{log_type} {operation}: {per_record:.2f} extra queries per "
+                f"record, budget is {budget}",
+            )
+        self.assertEqual(
+            self.env["auditlog.log"].search_count(
+                [("model_id", "=", self.model_id.id)]
+            ),
+            3 * BENCHMARK_SIZE,
+        )
+
+    def test_overhead_fast(self):
+        self._check_overhead("fast")
+
+    def test_overhead_full(self):
+        self._check_overhead("full")
@@ -1,61 +1,90 @@
 import logging
 from datetime import datetime, time
 from odoo import models, fields, api
+from odoo.tools import SQL
 
 
 _logger = logging.getLogger(__name__)
 
+# Default values of the metrics computed by _get_attendance_metrics
+ATTENDANCE_METRICS = {
+    'late_days': 0.0,
+    'late_hours': 0.0,
+    'late_permission_count': 0,
+    'late_permission_hours': 0.0,
+    'early_leaving_days': 0.0,
+    'early_leaving_hours': 0.0,
+    'overtime_hours': 0.0,
+    'days_attended': 0.0,
+    'weekend_days': 0.0,
+    'timeoff_days': 0.0,
+    'generic_timeoff_days': 0.0,
+    'unpaid_leaves': 0.0,
+    'sick_timeoff_days': 0.0,
+    'paid_timeoff_days': 0.0,
+    'casual_timeoff_days': 0.0,
+}
+
+# Work entry type codes counted in a dedicated time off field
+TIMEOFF_CODE_FIELDS = {
+    'LEAVE100': 'generic_timeoff_days',
+    'LEAVE90': 'unpaid_leaves',
+    'LEAVE110': 'sick_timeoff_days',
+    'LEAVE120': 'paid_timeoff_days',
+    'CAS100': 'casual_timeoff_days',
+}
+
 class HrPayslip(models.Model):
     _inherit = 'hr.payslip'
 
     late_days = fields.Float(
         string='Late Days',
-        compute='_compute_partial_shift_days_hours',
+        compute='_compute_attendance_metrics',
         help='Total days of late attendance for the payslip period.',
     )
     late_hours = fields.Float(
         string='Late Hours',
-        compute='_compute_partial_shift_days_hours',
+        compute='_compute_attendance_metrics',
         help='Total hours of late attendance for the payslip period.',
     )
     late_permission_count = fields.Integer(
         string='Late/Early Leaving Permissions',
-        compute='_compute_late_permission',
+        compute='_compute_attendance_metrics',
         help='Number of late permissions granted during the payslip period.',
     )
     late_permission_hours = fields.Float(
         string='Late/Early Leaving Permission Hours',
-        compute='_compute_late_permission',
+        compute='_compute_attendance_metrics',
         help='Total hours of late permissions granted during the payslip period.',
     )
     early_leaving_days = fields.Float(
         string='Early Leaving Days',
-        compute='_compute_partial_shift_days_hours',
+        compute='_compute_attendance_metrics',
         help='Total days of early leaving for the payslip period.',
     )
     early_leaving_hours = fields.Float(
         string='Early Leaving Hours',
-        compute='_compute_partial_shift_days_hours',
+        compute='_compute_attendance_metrics',
         help='Total hours of early leaving for the payslip period.',
     )
     overtime_hours = fields.Float(
         string='Overtime Hours (Approved)',
-        compute='_compute_overtime_hours',
+        compute='_compute_attendance_metrics',
         help='Total overtime hours for the payslip period.',
     )
     days_attended = fields.Float(
         string='Days Attended',
-        compute='_compute_days_attended',
+        compute='_compute_attendance_metrics',
         help='Total days of attendance for the payslip period.',
     )
     weekend_days = fields.Float(
         string='Weekend Off Days',
-        compute='_compute_weekend_days',
+        compute='_compute_attendance_metrics',
         help='Total weekend days for the payslip period.',
     )
     timeoff_days = fields.Float(
         string='Time Off Days',
-        compute='_compute_timeoff_days',
+        compute='_compute_attendance_metrics',
         help='Total time off days for the payslip period.',
     )
     absent_days = fields.Float(
@@ -65,23 +94,23 @@ class HrPayslip(models.Model):
     )
     generic_timeoff_days = fields.Float(
         string='Generic Time Off',
-        compute='_compute_timeoff_days',
+        compute='_compute_attendance_metrics',
     )
     unpaid_leaves = fields.Float(
         string='Unpaid Leaves',
-        compute='_compute_timeoff_days',
+        compute='_compute_attendance_metrics',
     )
     sick_timeoff_days = fields.Float(
         string='Sick Time Off',
-        compute='_compute_timeoff_days',
+        compute='_compute_attendance_metrics',
     )
     paid_timeoff_days = fields.Float(
         string='Paid Time Off',
-        compute='_compute_timeoff_days',
+        compute='_compute_attendance_metrics',
     )
     casual_timeoff_days = fields.Float(
         string='Casual Time Off',
-        compute='_compute_timeoff_days',
+        compute='_compute_attendance_metrics',
     )
 
     @api.depends('days_attended', 'timeoff_days', 'weekend_days')
@@ -90,86 +119,113 @@ class HrPayslip(models.Model):
             total_days = (payslip.date_to - payslip.date_from).days + 1
             payslip.absent_days = max(total_days - (payslip.days_attended + payslip.timeoff_days + payslip.weekend_days), 0)
 
-    def _compute_timeoff_days(self):
-        attendance_type = self.env.ref('hr_work_entry.work_entry_type_attendance')
-        for payslip in self:
-            from_date_midnight = datetime.combine(payslip.date_from, time.min)
-            end_of_to_date = datetime.combine(payslip.date_to, time.max)
-            timeoff_entries = self.env['hr.work.entry'].search([
-                ('employee_id', '=', payslip.employee_id.id),
-                ('date_start', '>=', from_date_midnight),
-                ('date_stop', '<=', end_of_to_date),
-                ('work_entry_type_id', '!=', attendance_type.id),
-                ('work_entry_type_id.code', 'not in', ['LATE', 'REST100'])
-            ])
-            payslip.timeoff_days = len(timeoff_entries)
-            payslip.generic_timeoff_days = len(timeoff_entries.filtered(lambda entry: entry.work_entry_type_id.code == 'LEAVE100'))
-            payslip.unpaid_leaves = len(timeoff_entries.filtered(lambda entry: entry.work_entry_type_id.code == 'LEAVE90'))
-            payslip.sick_timeoff_days = len(timeoff_entries.filtered(lambda entry: entry.work_entry_type_id.code == 'LEAVE110'))
-            payslip.paid_timeoff_days = len(timeoff_entries.filtered(lambda entry: entry.work_entry_type_id.code == 'LEAVE120'))
-            payslip.casual_timeoff_days = len(timeoff_entries.filtered(lambda entry: entry.work_entry_type_id.code == 'CAS100'))
-
-    def _compute_overtime_hours(self):
+    def _compute_attendance_metrics(self):
+        metrics = self._get_attendance_metrics()
         for payslip in self:
-            from_date_midnight = datetime.combine(payslip.date_from, time.min)
-            end_of_to_date = datetime.combine(payslip.date_to, time.max)
-            overtime_attendances = self.env['hr.attendance'].search([
-                ('employee_id', '=', payslip.employee_id.id),
-                ('check_in', '>=', from_date_midnight),
-                ('check_in', '<=', end_of_to_date),
-                ('overtime_status', '=', 'approved')
-            ])
-            payslip.overtime_hours = sum(overtime_attendances.mapped('validated_overtime_hours'))
+            payslip.update(metrics[payslip.id])
 
-    def _compute_late_permission(self):
+    def _get_attendance_metrics(self):
+        """Return {payslip id: {field name: value}} with the work entry and
+        attendance metrics of every payslip, loaded with one grouped query
+        per model for the whole recordset. Payslips of the same employee and
+        period share their metrics."""
+        keys = {}
+        payslip_keys = {}
         for payslip in self:
-            from_date_midnight = datetime.combine(payslip.date_from, time.min)
-            end_of_to_date = datetime.combine(payslip.date_to, time.max)
-            late_permissions = self.env['hr.work.entry'].search([
-                ('employee_id', '=', payslip.employee_id.id),
-                ('date_start', '>=', from_date_midnight),
-                ('date_stop', '<=', end_of_to_date),
-                ('work_entry_type_id.code', '=', 'LATE')
-            ])
-            payslip.late_permission_count = len(late_permissions)
-            payslip.late_permission_hours = sum(late_permissions.mapped('duration'))
+            key = (payslip.employee_id.id, payslip.date_from, payslip.date_to)
+            payslip_keys[payslip.id] = keys.setdefault(key, len(keys))
+        metrics = {index: dict(ATTENDANCE_METRICS) for index in keys.values()}
+        valid_keys = [(index, key) for key, index in keys.items() if all(key)]
+        if valid_keys:
+            keys_table = SQL(
+                "(VALUES %s) AS payslip_key(idx, employee_id, date_start, date_stop)",
+                SQL(", ").join(
+                    SQL("(%s, %s, %s::timestamp, %s::timestamp)", index, employee_id,
+                        datetime.combine(date_from, time.min), datetime.combine(date_to, time.max))
+                    for index, (employee_id, date_from, date_to) in valid_keys
+                ),
+            )
+            employee_ids = list({key[0] for __, key in valid_keys})
+            date_start = datetime.combine(min(key[1] for __, key in valid_keys), time.min)
+            date_stop = datetime.combine(max(key[2] for __, key in valid_keys), time.max)
+            self._add_work_entry_metrics(metrics, keys_table, employee_ids, date_start, date_stop)
+            self._add_attendance_metrics(metrics, keys_table, employee_ids, date_start, date_stop)
+        return {payslip_id: metrics[index] for payslip_id, index in payslip_keys.items()}
 
-    def _compute_weekend_days(self):
+    def _add_work_entry_metrics(self, metrics, keys_table, employee_ids, date_start, date_stop):
         attendance_type = self.env.ref('hr_work_entry.work_entry_type_attendance')
-        for payslip in self:
-            from_date_midnight = datetime.combine(payslip.date_from, time.min)
-            end_of_to_date = datetime.combine(payslip.date_to, time.max)
-            weekend_days = self.env['hr.work.entry'].search_count([
-                ('employee_id', '=', payslip.employee_id.id),
-                ('date_start', '>=', from_date_midnight),
-                ('date_stop', '<=', end_of_to_date),
-                ('work_entry_type_id.code', '=', 'REST100')
-            ])
-            payslip.weekend_days = weekend_days
-
-    def _compute_days_attended(self):
-        for payslip in self:
-            from_date_midnight = datetime.combine(payslip.date_from, time.min)
-            end_of_to_date = datetime.combine(payslip.date_to, time.max)
-            days_attended = self.env['hr.attendance'].search_count([
-                ('employee_id', '=', payslip.employee_id.id),
-                ('check_in', '>=', from_date_midnight),
-                ('check_in', '<=', end_of_to_date)
-            ])
-            payslip.days_attended = days_attended
+        query = self.env['hr.work.entry']._search([
+            ('employee_id', 'in', employee_ids),
+            ('date_start', '>=', date_start),
+            ('date_stop', '<=', date_stop),
+        ])
+        self.env.cr.execute(SQL(
+            """SELECT payslip_key.idx, hr_work_entry_type.code,
+                      hr_work_entry.work_entry_type_id IS DISTINCT FROM %(attendance_type)s,
+                      COUNT(*), SUM(hr_work_entry.duration)
+                 FROM %(from_clause)s
+                 JOIN %(keys_table)s
+                   ON hr_work_entry.employee_id = payslip_key.employee_id
+                  AND hr_work_entry.date_start >= payslip_key.date_start
+                  AND hr_work_entry.date_stop <= payslip_key.date_stop
+            LEFT JOIN hr_work_entry_type ON hr_work_entry_type.id = hr_work_entry.work_entry_type_id
+                WHERE %(where_clause)s
+             GROUP BY 1, 2, 3""",
+            attendance_type=attendance_type.id,
+            from_clause=query.from_clause,
+            keys_table=keys_table,
+            where_clause=query.where_clause or SQL("TRUE"),
+        ))
+        for index, code, is_timeoff, count, duration in self.env.cr.fetchall():
+            values = metrics[index]
+            if code == 'LATE':
+                values['late_permission_count'] += count
+                values['late_permission_hours'] += duration or 0.0
+            elif code == 'REST100':
+                values['weekend_days'] += count
+            elif is_timeoff:
+                values['timeoff_days'] += count
+                if code in TIMEOFF_CODE_FIELDS:
+                    values[TIMEOFF_CODE_FIELDS[code]] += count
 
-    def _compute_partial_shift_days_hours(self):
-        for payslip in self:
-            from_date_midnight = datetime.combine(payslip.date_from, time.min)
-            end_of_to_date = datetime.combine(payslip.date_to, time.max)
-            attendances = self.env['hr.attendance'].search([
-                ('employee_id', '=', payslip.employee_id.id),
-                ('check_in', '>=', from_date_midnight),
-                ('check_in', '<=', end_of_to_date)
-            ])
-            late_days_hours = attendances.filtered('late_check_in_approved').get_late_days_hours()
-            payslip.late_days = late_days_hours['late_days']
-            payslip.late_hours = late_days_hours['late_hours']
-            early_leaving_days_hours = attendances.filtered('early_check_out_approved').get_early_leaving_days_hours()
-            payslip.early_leaving_days = early_leaving_days_hours['early_leaving_days']
-            payslip.early_leaving_hours = early_leaving_days_hours['early_leaving_hours']
+    def _add_attendance_metrics(self, metrics, keys_table, employee_ids, date_start, date_stop):
+        params = self.env['ir.config_parameter'].sudo()
+        allowed_late_hours = int(params.get_param('hr_attendance_deviation.allowed_late_minutes', default=30)) / 60.0
+        allowed_early_leaving_hours = int(params.get_param(
+            'hr_attendance_deviation.allowed_early_leaving_minutes', default=15)) / 60.0
+        query = self.env['hr.attendance']._search([
+            ('employee_id', 'in', employee_ids),
+            ('check_in', '>=', date_start),
+            ('check_in', '<=', date_stop),
+        ])
+        self.env.cr.execute(SQL(
+            """SELECT payslip_key.idx,
+                      COUNT(*),
+                      SUM(hr_attendance.validated_overtime_hours) FILTER (WHERE hr_attendance.overtime_status = 'approved'),
+                      COUNT(*) FILTER (WHERE %(late)s),
+                      SUM(hr_attendance.late_check_in) FILTER (WHERE %(late)s),
+                      COUNT(*) FILTER (WHERE %(early)s),
+                      SUM(hr_attendance.early_check_out) FILTER (WHERE %(early)s)
+                 FROM %(from_clause)s
+                 JOIN %(keys_table)s
+                   ON hr_attendance.employee_id = payslip_key.employee_id
+                  AND hr_attendance.check_in >= payslip_key.date_start
+                  AND hr_attendance.check_in <= payslip_key.date_stop
+                WHERE %(where_clause)s
+             GROUP BY payslip_key.idx""",
+            late=SQL("hr_attendance.late_check_in_approved AND hr_attendance.late_check_in > %s", allowed_late_hours),
+            early=SQL("hr_attendance.early_check_out_approved AND hr_attendance.early_check_out > %s",
+                      allowed_early_leaving_hours),
+            from_clause=query.from_clause,
+            keys_table=keys_table,
+            where_clause=query.where_clause or SQL("TRUE"),
+        ))
+        for index, days_attended, overtime_hours, late_days, late_hours, early_days, early_hours in self.env.cr.fetchall():
+            metrics[index].update({
+                'days_attended': days_attended,
+                'overtime_hours': overtime_hours or 0.0,
+                'late_days': late_days,
+                'late_hours': late_hours or 0.0,
+                'early_leaving_days': early_days,
+                'early_leaving_hours': early_hours or 0.0,
+            })
@@ -1,6 +1,9 @@
 from odoo import models, fields, api, _
 from datetime import date
 
+# States of the custody items not returned yet
+UNCLEARED_STATES = ['draft', 'received']
+
 class HrCustody(models.Model):
     _name = 'hr.custody'
     _description = 'Employee Custody'
@@ -45,6 +48,15 @@ class HrCustody(models.Model):
             if contract:
                 self.contract_id = contract.id
 
+    @api.model
+    def _get_uncleared_counts(self, field_name, records):
+        """Return the number of uncleared custody items of each record, with
+        field_name the custody field linking to them."""
+        groups = self._read_group(
+            [(field_name, 'in', records.ids), ('state', 'in', UNCLEARED_STATES)],
+            [field_name], ['__count'])
+        return {record.id: count for record, count in groups}
+
     def action_receive(self):
         for rec in self:
             rec.state = 'received'
@@ -8,30 +8,23 @@ class HrContract(models.Model):
 
     def write(self, vals):
         if ('state' in vals and vals['state'] in ['close', 'cancel']) or ('active' in vals and not vals['active']):
-            for contract in self:
-                uncleared = self.env['hr.custody'].search([
-                    ('contract_id', '=', contract.id),
-                    ('state', 'in', ['draft', 'received'])
-                ])
-                if uncleared:
-                    raise ValidationError(_('Cannot close or archive contract! The employee has %s uncleared custody items linked to this contract.') % len(uncleared))
+            uncleared_counts = self.env['hr.custody']._get_uncleared_counts('contract_id', self)
+            if uncleared_counts:
+                raise ValidationError(_('Cannot close or archive contract! The employee has %s uncleared custody items linked to this contract.') % next(iter(uncleared_counts.values())))
         return super(HrContract, self).write(vals)
 
 class HrEmployee(models.Model):
     _inherit = 'hr.employee'
 
     custody_ids = fields.One2many('hr.custody', 'employee_id', string='Custody')
-    custody_count = fields.Integer(string='Custody Count', compute='_compute_custody_count')
+    custody_count = fields.Integer(string='Custody Count', compute='_compute_custody_count', store=True)
 
-    @api.depends('custody_ids.state')
+    @api.depends('custody_ids.state', 'custody_ids.active')
     def _compute_custody_count(self):
+        # Only uncleared items are counted
+        uncleared_counts = self.env['hr.custody']._get_uncleared_counts('employee_id', self)
         for employee in self:
-            # Only count uncleared items? Or all? User said "clear also from employee card"
-            # I will count only uncleared.
-            employee.custody_count = self.env['hr.custody'].search_count([
-                ('employee_id', '=', employee.id),
-                ('state', 'in', ['draft', 'received'])
-            ])
+            employee.custody_count = uncleared_counts.get(employee.id, 0)
 
     def action_view_custody(self):
         self.ensure_one()
@@ -46,11 +39,7 @@ class HrEmployee(models.Model):
 
     def write(self, vals):
         if 'active' in vals and not vals['active']:
-             for employee in self:
-                uncleared = self.env['hr.custody'].search([
-                    ('employee_id', '=', employee.id),
-                    ('state', 'in', ['draft', 'received'])
-                ])
-                if uncleared:
-                    raise ValidationError(_('Cannot archive employee! The employee has %s uncleared custody items.') % len(uncleared))
+            uncleared_counts = self.env['hr.custody']._get_uncleared_counts('employee_id', self)
+            if uncleared_counts:
+                raise ValidationError(_('Cannot archive employee! The employee has %s uncleared custody items.') % next(iter(uncleared_counts.values())))
         return super(HrEmployee, self).write(vals)
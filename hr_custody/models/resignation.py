@@ -6,13 +6,8 @@ class HrResignation(models.Model):
 
     def action_approve_resignation(self):
         # Check for uncleared custody
-        for resignation in self:
-            if resignation.employee_id:
-                uncleared_custody = self.env['hr.custody'].search([
-                    ('employee_id', '=', resignation.employee_id.id),
-                    ('state', 'in', ['draft', 'received'])
-                ])
-                if uncleared_custody:
-                    raise ValidationError(_('Cannot approve resignation. The employee has %s uncleared custody items.') % len(uncleared_custody))
+        uncleared_counts = self.env['hr.custody']._get_uncleared_counts('employee_id', self.employee_id)
+        if uncleared_counts:
+            raise ValidationError(_('Cannot approve resignation. The employee has %s uncleared custody items.') % next(iter(uncleared_counts.values())))
         
         return super(HrResignation, self).action_approve_resignation()
@@ -22,10 +22,14 @@
 #############################################################################
 from datetime import timedelta
 from odoo import api, fields, models, _
+from odoo.tools import html_escape
 
 GENDER_SELECTION = [('male', 'Male'),
                     ('female', 'Female'),
                     ('other', 'Other')]
+# Notice given before the expiry of the ID and the passport
+ID_EXPIRY_NOTICE = timedelta(days=15)
+PASSPORT_EXPIRY_NOTICE = timedelta(days=181)
 
 
 class HrEmployee(models.Model):
@@ -52,6 +56,14 @@ class HrEmployee(models.Model):
         'passport_attachment_rel',
         'passport_ref', 'attach_ref1', string="Attachment",
         help='Attach the copy of Passport')
+    id_expiry_notification_date = fields.Date(
+        compute='_compute_id_expiry_notification_date', store=True,
+        index=True, groups='hr.group_hr_user',
+        help='First day the ID expiry notification is sent')
+    passport_expiry_notification_date = fields.Date(
+        compute='_compute_passport_expiry_notification_date', store=True,
+        index=True, groups='hr.group_hr_user',
+        help='First day the passport expiry notification is sent')
     family_info_ids = fields.One2many('hr.employee.family', 'employee_id',
                                       string='Family',
                                       help='Family Information')
@@ -78,45 +90,55 @@ class HrEmployee(models.Model):
                 'birth_date': self.spouse_birthdate,
             })]
 
+    @api.depends('id_expiry_date')
+    def _compute_id_expiry_notification_date(self):
+        """Compute the first day the ID expiry notification is sent."""
+        for employee in self:
+            employee.id_expiry_notification_date = employee.id_expiry_date \
+                and employee.id_expiry_date - ID_EXPIRY_NOTICE
+
+    @api.depends('passport_expiry_date')
+    def _compute_passport_expiry_notification_date(self):
+        """Compute the first day the passport expiry notification is sent."""
+        for employee in self:
+            employee.passport_expiry_notification_date = \
+                employee.passport_expiry_date \
+                and employee.passport_expiry_date - PASSPORT_EXPIRY_NOTICE
+
+    @api.model
     def expiry_mail_reminder(self):
-        """Sending  ID and Passport expiry notification."""
-        current_date = fields.Date.context_today(self) + timedelta(days=1)
-        employee_ids = self.search(['|', ('id_expiry_date', '!=', False),
-                                    ('passport_expiry_date', '!=', False)])
-        for employee in employee_ids:
-            if employee.id_expiry_date:
-                exp_date = fields.Date.from_string(
-                    employee.id_expiry_date) - timedelta(days=14)
-                if current_date >= exp_date:
-                    mail_content = ("Hello  " + employee.name + ",<br>Your ID "
-                                    + employee.identification_id +
-                                    " is going to expire on " +
-                                    str(employee.id_expiry_date)
-                                    + ". Please renew it before expiry date")
-                    main_content = {
-                        'subject': _('ID-%s Expired On %s') % (
-                            employee.identification_id,
-                            employee.id_expiry_date),
-                        'author_id': self.env.user.partner_id.id,
-                        'body_html': mail_content,
-                        'email_to': employee.work_email,
-                    }
-                    self.env['mail.mail'].sudo().create(main_content).send()
-            if employee.passport_expiry_date:
-                exp_date = fields.Date.from_string(
-                    employee.passport_expiry_date) - timedelta(days=180)
-                if current_date >= exp_date:
-                    mail_content = ("  Hello  " + employee.name +
-                                    ",<br>Your Passport " + employee.passport_id
-                                    +" is going to expire on " +
-                                    str(employee.passport_expiry_date) +
-                                    ". Please renew it before expire")
-                    main_content = {
-                        'subject': _('Passport-%s Expired On %s') % (
-                            employee.passport_id,
-                            employee.passport_expiry_date),
-                        'author_id': self.env.user.partner_id.id,
-                        'body_html': mail_content,
-                        'email_to': employee.work_email,
-                    }
-                    self.env['mail.mail'].sudo().create(main_content).send()
+        """Queue one digest mail per employee whose ID or passport is going
+        to expire."""
+        today = fields.Date.context_today(self)
+        employees = self.search([
+            ('work_email', '!=', False),
+            '|', '&', ('id_expiry_notification_date', '<=', today),
+            ('id_expiry_date', '>=', today),
+            '&', ('passport_expiry_notification_date', '<=', today),
+            ('passport_expiry_date', '>=', today)])
+        mail_values = []
+        for employee in employees:
+            document_lines = []
+            if employee.id_expiry_date and \
+                    employee.id_expiry_notification_date <= today \
+                    <= employee.id_expiry_date:
+                document_lines.append(
+                    f"<li>ID {html_escape(employee.identification_id or '')}: "
+                    f"{employee.id_expiry_date}</li>")
+            if employee.passport_expiry_date and \
+                    employee.passport_expiry_notification_date <= today \
+                    <= employee.passport_expiry_date:
+                document_lines.append(
+                    f"<li>Passport {html_escape(employee.passport_id or '')}: "
+                    f"{employee.passport_expiry_date}</li>")
+            mail_values.append({
+                'subject': _('ID and Passport Expiry Reminder'),
+                'author_id': self.env.user.partner_id.id,
+                'body_html': (
+                    f"Hello {html_escape(employee.name)},<br>The following "
+                    "documents are going to expire. Please renew them before "
+                    f"the expiry date.<ul>{''.join(document_lines)}</ul>"),
+                'email_to': employee.work_email,
+            })
+        # sent by the mail queue
+        self.env['mail.mail'].sudo().create(mail_values)
@@ -1,5 +1,6 @@
 import logging
 from odoo import models, fields, api
+from odoo.tools import SQL
 
 
 _logger = logging.getLogger(__name__)
@@ -19,12 +20,55 @@ class HrPayslip(models.Model):
     )
 
     def _compute_incentives_amount(self):
+        totals = self._get_incentive_totals()
         for payslip in self:
-            incentives = self.env['hr.incentive'].sudo().search([
-                ('employee_id', '=', payslip.employee_id.id),
-                ('date', '>=', payslip.date_from),
-                ('date', '<=', payslip.date_to),
+            payslip.bonus_amount = totals[payslip.id]['bonus_amount']
+            payslip.penalty_amount = totals[payslip.id]['penalty_amount']
+
+    def _get_incentive_totals(self):
+        """Return {payslip id: {'bonus_amount', 'penalty_amount', 'count'}}
+        for the approved incentives of every payslip's employee and period,
+        loaded with one grouped query for the whole recordset."""
+        keys = {}
+        payslip_keys = {}
+        for payslip in self:
+            key = (payslip.employee_id.id, payslip.date_from, payslip.date_to)
+            payslip_keys[payslip.id] = keys.setdefault(key, len(keys))
+        totals = {
+            index: {'bonus_amount': 0.0, 'penalty_amount': 0.0, 'count': 0}
+            for index in keys.values()
+        }
+        valid_keys = [(index, key) for key, index in keys.items() if all(key)]
+        if valid_keys:
+            keys_table = SQL(
+                "(VALUES %s) AS payslip_key(idx, employee_id, date_from, date_to)",
+                SQL(", ").join(
+                    SQL("(%s, %s, %s::date, %s::date)", index, employee_id, date_from, date_to)
+                    for index, (employee_id, date_from, date_to) in valid_keys
+                ),
+            )
+            query = self.env['hr.incentive'].sudo()._search([
+                ('employee_id', 'in', list({key[0] for __, key in valid_keys})),
+                ('date', '>=', min(key[1] for __, key in valid_keys)),
+                ('date', '<=', max(key[2] for __, key in valid_keys)),
                 ('state', '=', 'approved'),
             ])
-            payslip.bonus_amount = sum(incentives.filtered(lambda i: i.type == 'bonus').mapped('amount'))
-            payslip.penalty_amount = sum(incentives.filtered(lambda i: i.type == 'penalty').mapped('amount'))
\ No newline at end of file
+            self.env.cr.execute(SQL(
+                """SELECT payslip_key.idx, hr_incentive.type,
+                          COUNT(*), SUM(hr_incentive.amount)
+                     FROM %(from_clause)s
+                     JOIN %(keys_table)s
+                       ON hr_incentive.employee_id = payslip_key.employee_id
+                      AND hr_incentive.date >= payslip_key.date_from
+                      AND hr_incentive.date <= payslip_key.date_to
+                    WHERE %(where_clause)s
+                 GROUP BY 1, 2""",
+                from_clause=query.from_clause,
+                keys_table=keys_table,
+                where_clause=query.where_clause or SQL("TRUE"),
+            ))
+            for index, incentive_type, count, amount in self.env.cr.fetchall():
+                totals[index]['count'] += count
+                if incentive_type in ('bonus', 'penalty'):
+                    totals[index]['%s_amount' % incentive_type] += amount or 0.0
+        return {payslip_id: totals[index] for payslip_id, index in payslip_keys.items()}
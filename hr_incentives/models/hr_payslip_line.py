@@ -3,21 +3,14 @@ from odoo import models
 class HrPayslipLine(models.Model):
     _inherit = 'hr.payslip.line'
 
-    def _compute_related_records_count(self):
-        for line in self:
-            if line.salary_rule_id.code != 'INCENTIV':
-                super(HrPayslipLine, line)._compute_related_records_count()
-            else:
-                date_from = line.slip_id.date_from
-                date_to = line.slip_id.date_to
-                employee_id = line.slip_id.employee_id
-                incentives_count = self.env['hr.incentive'].search_count([
-                    ('employee_id', '=', employee_id.id),
-                    ('date', '>=', date_from),
-                    ('date', '<=', date_to),
-                    ('state', '=', 'approved'),
-                ])
-                line.update({'related_records_count': incentives_count})
+    def _get_related_records_counters(self):
+        counters = super()._get_related_records_counters()
+        counters['INCENTIV'] = '_count_incentive_records'
+        return counters
+
+    def _count_incentive_records(self):
+        totals = self.slip_id._get_incentive_totals()
+        return {line.id: totals[line.slip_id.id]['count'] for line in self}
 
     def open_related_records(self):
         self.ensure_one()
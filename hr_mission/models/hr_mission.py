@@ -66,43 +66,49 @@ class HrMission(models.Model):
 
     def action_cancel(self):
         # Delete associated attendance records upon cancellation
-        self.env['hr.attendance'].search([('mission_id', 'in', self.ids)]).unlink()
+        self.attendance_ids.unlink()
         self.write({'state': 'cancelled'})
 
+    def _get_shift_table(self):
+        """Return the shift of each weekday of the employees' calendars, as
+        {calendar_id: {weekday: (time_from, time_to)}}, a weekday with several
+        attendances spanning from the first to the last one."""
+        calendars = self.employee_id.contract_id.resource_calendar_id
+        shift_table = {}
+        for calendar in calendars:
+            day_hours = {}
+            for attendance in calendar.attendance_ids:
+                if attendance.display_type:
+                    continue
+                weekday = int(attendance.dayofweek)
+                hour_from, hour_to = day_hours.get(weekday, (attendance.hour_from, attendance.hour_to))
+                day_hours[weekday] = (min(hour_from, attendance.hour_from), max(hour_to, attendance.hour_to))
+            shift_table[calendar.id] = {
+                weekday: (self._convert_float_to_time(hour_from), self._convert_float_to_time(hour_to))
+                for weekday, (hour_from, hour_to) in day_hours.items()
+            }
+        return shift_table
+
     def _create_attendance_records(self):
+        shift_table = self._get_shift_table()
         vals_list = []
         for record in self:
+            shifts = shift_table.get(record.employee_id.contract_id.resource_calendar_id.id, {})
             current_date = record.start_date
             while current_date <= record.end_date:
-                vals = record._get_shift_start_end(current_date)
-                if vals:
-                    vals_list.append(vals)
+                shift = shifts.get(current_date.weekday())
+                if shift:
+                    vals_list.append({
+                        'employee_id': record.employee_id.id,
+                        'check_in': self._convert_to_gmt_naive(current_date, shift[0]),
+                        'check_out': self._convert_to_gmt_naive(current_date, shift[1]),
+                        'mission_id': record.id,
+                    })
                 current_date += timedelta(days=1)
         if not vals_list:
             raise ValidationError("No attendance shifts found for the mission period. Please ensure attendance shifts are recorded before approving the mission.")
         self.env['hr.attendance'].create(vals_list)
 
-    def _get_shift_start_end(self, date):
-        contract = self.employee_id.contract_id
-        attendances = contract.resource_calendar_id.attendance_ids
-        dayofweek = str(date.weekday())
-        dayofweek_attendance = attendances.filtered(lambda at: str(at.dayofweek) == dayofweek)
-        shift_start_datetime, shift_end_datetime = self._get_shift_datetimes(dayofweek_attendance, date)
-        if dayofweek_attendance:
-            return{
-                'employee_id': self.employee_id.id,
-                'check_in': shift_start_datetime,
-                'check_out': shift_end_datetime,
-                'mission_id': self.id
-            }
-
-    def _get_shift_datetimes(self, shift, date):
-        shift_hour_from_time = self._convert_float_to_time(shift.hour_from)
-        shift_hour_to_time = self._convert_float_to_time(shift.hour_to)
-        shift_start_datetime = self._convert_to_gmt_naive(date, shift_hour_from_time)
-        shift_end_datetime = self._convert_to_gmt_naive(date, shift_hour_to_time)
-        return shift_start_datetime, shift_end_datetime
-
     def _convert_float_to_time(self, float_time):
         return Converter.float_to_time_obj(float_time)
 
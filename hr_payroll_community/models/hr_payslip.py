@@ -21,7 +21,8 @@
 #
 #############################################################################
 import logging
-from datetime import date, datetime, time
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
 from dateutil.relativedelta import relativedelta
 from odoo import api, fields, models, tools, _
 from odoo.exceptions import UserError, ValidationError
@@ -247,27 +248,38 @@ class HrPayslip(models.Model):
         @return: returns a list of dict containing the input that should be
         applied for the given contract between date_from and date_to
         """
+        prefetched_lines = self.env.context.get('payslip_worked_day_lines')
+        if prefetched_lines is not None and all(
+                contract_id in prefetched_lines
+                for contract_id in contracts.ids):
+            return [line for contract_id in contracts.ids
+                    for line in prefetched_lines[contract_id]]
         res = []
         # fill only if the contract as a working schedule linked
-        for contract in contracts.filtered(
-                lambda contract: contract.resource_calendar_id):
-            day_from = datetime.combine(fields.Date.from_string(date_from),
-                                        time.min)
-            day_to = datetime.combine(fields.Date.from_string(date_to),
-                                      time.max)
+        contracts = contracts.filtered(
+            lambda contract: contract.resource_calendar_id)
+        if not contracts:
+            return res
+        day_from = datetime.combine(fields.Date.from_string(date_from),
+                                    time.min)
+        day_to = datetime.combine(fields.Date.from_string(date_to),
+                                  time.max)
+        # compute worked days of all the contracts in one batched pass
+        contracts_work_data = self.env[
+            'hr.employee']._get_work_days_data_batch(
+            [(contract.employee_id, day_from, day_to,
+              contract.resource_calendar_id) for contract in contracts])
+        calendars_day_hours = self._get_calendar_day_hours(
+            contracts.resource_calendar_id, day_from, day_to)
+        for contract, work_data in zip(contracts, contracts_work_data):
             # compute leave days
             leaves = {}
             calendar = contract.resource_calendar_id
-            tz = timezone(calendar.tz)
             day_leave_intervals = contract.employee_id.list_leaves(
                 day_from, day_to, calendar=contract.resource_calendar_id)
             multi_leaves = []
             for day, hours, leave in day_leave_intervals:
-                work_hours = calendar.get_work_hours_count(
-                    tz.localize(datetime.combine(day, time.min)),
-                    tz.localize(datetime.combine(day, time.max)),
-                    compute_leaves=False,
-                )
+                work_hours = calendars_day_hours[calendar][day]
                 if len(leave) > 1:
                     for each in leave:
                         if each.holiday_id:
@@ -290,8 +302,6 @@ class HrPayslip(models.Model):
                         current_leave_struct[
                             'number_of_days'] += hours / work_hours
             # compute worked days
-            work_data = contract.employee_id.get_work_days_data(
-                day_from, day_to, calendar=contract.resource_calendar_id)
             attendances = {
                 'name': _("Normal Working Days paid at 100%"),
                 'sequence': 1,
@@ -330,6 +340,26 @@ class HrPayslip(models.Model):
             res.extend(leaves.values())
         return res
 
+    @api.model
+    def _get_calendar_day_hours(self, calendars, day_from, day_to):
+        """
+        @param calendars: Browse record of resource calendars
+        @return: returns a dict {calendar: {date: hours}} giving the working
+        hours of each day of the calendars, leaves not deducted
+        """
+        calendars_day_hours = {}
+        for calendar in calendars:
+            tz = timezone(calendar.tz)
+            # one extra day margin, leave days being in the employee timezone
+            intervals = calendar._attendance_intervals_batch(
+                tz.localize(day_from - timedelta(days=1)),
+                tz.localize(day_to + timedelta(days=1)))[False]
+            day_hours = calendars_day_hours[calendar] = defaultdict(float)
+            for start, stop, meta in intervals:
+                day_hours[start.date()] += (
+                    stop - start).total_seconds() / 3600
+        return calendars_day_hours
+
     @api.model
     def get_inputs(self, contracts, date_from, date_to):
         """Function for getting contracts upon date_from and date_to fields"""
@@ -353,6 +383,13 @@ class HrPayslip(models.Model):
                 res.append(input_data)
         return res
 
+    @api.model
+    def _get_inputs_prefetch(self, employees, date_from, date_to):
+        """Hook for input providers to load their data for a whole batch of
+        employees at once. Returns context values, which get_inputs
+        overrides can serve from instead of searching per payslip."""
+        return {}
+
     @api.model
     def _get_payslip_lines(self, contract_ids, payslip_id):
         """Function for getting Payslip Lines"""
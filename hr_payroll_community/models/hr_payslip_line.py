@@ -23,6 +23,8 @@
 from odoo import api, fields, models, _
 from odoo.addons import decimal_precision as dp
 from odoo.exceptions import UserError
+from odoo.osv import expression
+from odoo.tools import SQL
 
 
 class HrPayslipLine(models.Model):
@@ -83,4 +85,94 @@ class HrPayslipLine(models.Model):
         return
 
     def _compute_related_records_count(self):
-        self.update({'related_records_count': 0})
+        """Function for compute the related records of the lines, grouped
+        by salary rule code so that each counter reads all its lines at
+        once"""
+        counters = self._get_related_records_counters()
+        for code, lines in self.grouped(
+                lambda line: line.salary_rule_id.code).items():
+            counter = counters.get(code)
+            counts = getattr(lines, counter)() if counter else {}
+            for line in lines:
+                line.related_records_count = counts.get(line.id, 0)
+
+    def _get_related_records_counters(self):
+        """Return {salary rule code: method name} of the related records
+        counters. Each method is called on all the lines of its code and
+        returns {line id: count}. Inheriting modules register their rule
+        codes by extending the returned dict."""
+        return {}
+
+    def _count_related_records(self, model_name, domain, employee_field,
+                               date_field, date_stop_field=None):
+        """Return {line id: count} of the records of model_name matching
+        domain, whose employee_field is the employee of the line's payslip
+        and whose date_field falls within the payslip period. Datetime
+        fields cover the whole last day of the period. When date_stop_field
+        is given, the records must end before the end of the last day of
+        the period instead. All the counts are read with one query grouped
+        by (employee, period), with the access rights of the current user
+        like the records listed when opening them."""
+        keys = {}
+        line_keys = {}
+        for line in self:
+            slip = line.slip_id
+            key = (slip.employee_id.id, slip.date_from, slip.date_to)
+            if all(key):
+                line_keys[line.id] = keys.setdefault(key, len(keys))
+        if not keys:
+            return {}
+        model = self.env[model_name].sudo(False)
+        query = model._search(expression.AND([domain, [
+            (employee_field, 'in', list({key[0] for key in keys})),
+        ]]))
+        employee_sql = self._related_field_to_sql(model, employee_field, query)
+        date_sql = model._field_to_sql(model._table, date_field, query)
+        date_to_field = date_stop_field or date_field
+        date_to_sql = model._field_to_sql(model._table, date_to_field, query)
+        if model._fields[date_to_field].type == 'datetime':
+            date_to_condition = SQL(
+                "%s < payslip_key.date_to + 1", date_to_sql)
+        else:
+            date_to_condition = SQL("%s <= payslip_key.date_to", date_to_sql)
+        keys_table = SQL(
+            "(VALUES %s) AS payslip_key(idx, employee_id, date_from, date_to)",
+            SQL(", ").join(
+                SQL("(%s, %s, %s::date, %s::date)",
+                    index, employee_id, date_from, date_to)
+                for (employee_id, date_from, date_to), index in keys.items()
+            ),
+        )
+        self.env.cr.execute(SQL(
+            """SELECT payslip_key.idx, COUNT(*)
+                 FROM %(from_clause)s
+                 JOIN %(keys_table)s
+                   ON %(employee_sql)s = payslip_key.employee_id
+                  AND %(date_sql)s >= payslip_key.date_from
+                  AND %(date_to_condition)s
+                WHERE %(where_clause)s
+             GROUP BY 1""",
+            from_clause=query.from_clause,
+            keys_table=keys_table,
+            employee_sql=employee_sql,
+            date_sql=date_sql,
+            date_to_condition=date_to_condition,
+            where_clause=query.where_clause or SQL("TRUE"),
+        ))
+        counts = dict(self.env.cr.fetchall())
+        return {line_id: counts.get(index, 0)
+                for line_id, index in line_keys.items()}
+
+    def _related_field_to_sql(self, model, path, query):
+        """Return the SQL of the field path of model (e.g.
+        'loan_id.employee_id'), joining the many2one tables on the way"""
+        alias = model._table
+        *links, fname = path.split('.')
+        for link in links:
+            comodel = self.env[model._fields[link].comodel_name]
+            coalias = query.make_alias(alias, link)
+            query.add_join('JOIN', coalias, comodel._table, SQL(
+                "%s = %s", model._field_to_sql(alias, link, query),
+                SQL.identifier(coalias, 'id')))
+            model, alias = comodel, coalias
+        return model._field_to_sql(alias, fname, query)
@@ -23,9 +23,10 @@
 from collections import defaultdict
 from datetime import timedelta
 
-from pytz import utc
+from pytz import timezone, utc
 
 from odoo import models
+from odoo.addons.resource.models.utils import Intervals
 from odoo.tools import float_utils
 
 # This will generate 16th of days
@@ -48,41 +49,80 @@ class ResourceMixin(models.AbstractModel):
             Returns a dict {'days': n, 'hours': h} containing the
             quantity of working time expressed as days and as hours.
         """
-        resource = self.resource_id
-        calendar = calendar or self.resource_calendar_id
-        # naive datetime are made explicit in UTC
-        if not from_datetime.tzinfo:
-            from_datetime = from_datetime.replace(tzinfo=utc)
-        if not to_datetime.tzinfo:
-            to_datetime = to_datetime.replace(tzinfo=utc)
-        # total hours per day: retrieve attendances with one extra day margin,
-        # in order to compute the total hours on the first and last days
-        from_full = from_datetime - timedelta(days=1)
-        to_full = to_datetime + timedelta(days=1)
-        intervals = calendar._attendance_intervals_batch(from_full, to_full,
-                                                         resource)
-        day_total = defaultdict(float)
-        for start, stop, meta in intervals[resource.id]:
-            day_total[start.date()] += (stop - start).total_seconds() / 3600
-        # actual hours per day
-        if compute_leaves:
-            intervals = calendar._work_intervals_batch(from_datetime,
-                                                       to_datetime, resource,
-                                                       domain)
-        else:
-            intervals = calendar._attendance_intervals_batch(from_datetime,
-                                                             to_datetime,
-                                                             resource)
-        day_hours = defaultdict(float)
-        for start, stop, meta in intervals[resource.id]:
-            day_hours[start.date()] += (stop - start).total_seconds() / 3600
-        # compute number of days as quarters
-        days = sum(
-            float_utils.round(ROUNDING_FACTOR * day_hours[day] / day_total[
-                day]) / ROUNDING_FACTOR
-            for day in day_hours
-        )
-        return {
-            'days': days,
-            'hours': sum(day_hours.values()),
-        }
+        self.ensure_one()
+        return self._get_work_days_data_batch(
+            [(self, from_datetime, to_datetime, calendar)],
+            compute_leaves=compute_leaves, domain=domain)[0]
+
+    def _get_work_days_data_batch(self, date_ranges, compute_leaves=True,
+                                  domain=None):
+        """
+            Batched version of `get_work_days_data` for many records and
+            date ranges at once.
+
+            `date_ranges` is a list of (record, from_datetime, to_datetime,
+            calendar) tuples, a falsy calendar meaning the resource calendar
+            of the record. The intervals are computed once per calendar
+            over the union of its date ranges, then cut per request.
+
+            Returns a list of dicts {'days': n, 'hours': h}, in the order
+            of `date_ranges`.
+        """
+        result = [None] * len(date_ranges)
+        calendar_requests = defaultdict(list)
+        for index, (record, from_datetime, to_datetime,
+                    calendar) in enumerate(date_ranges):
+            # naive datetime are made explicit in UTC
+            if not from_datetime.tzinfo:
+                from_datetime = from_datetime.replace(tzinfo=utc)
+            if not to_datetime.tzinfo:
+                to_datetime = to_datetime.replace(tzinfo=utc)
+            calendar_requests[calendar or record.resource_calendar_id].append(
+                (index, record.resource_id, from_datetime, to_datetime))
+        for calendar, requests in calendar_requests.items():
+            resources = self.env['resource.resource'].union(
+                *(resource for __, resource, __, __ in requests))
+            from_datetime = min(request[2] for request in requests)
+            to_datetime = max(request[3] for request in requests)
+            # total hours per day: retrieve attendances with one extra day
+            # margin, in order to compute the total hours on the first and
+            # last days
+            intervals = calendar._attendance_intervals_batch(
+                from_datetime - timedelta(days=1),
+                to_datetime + timedelta(days=1), resources)
+            day_totals = {}
+            for resource_id, resource_intervals in intervals.items():
+                day_total = day_totals[resource_id] = defaultdict(float)
+                for start, stop, meta in resource_intervals:
+                    day_total[start.date()] += (
+                        stop - start).total_seconds() / 3600
+            # actual hours per day
+            if compute_leaves:
+                intervals = calendar._work_intervals_batch(
+                    from_datetime, to_datetime, resources, domain)
+            else:
+                intervals = calendar._attendance_intervals_batch(
+                    from_datetime, to_datetime, resources)
+            for index, resource, request_from, request_to in requests:
+                # cut the intervals to the requested range, expressed in the
+                # timezone of the intervals to keep the same days
+                tz = timezone(resource.tz or calendar.tz)
+                request_intervals = intervals[resource.id] & Intervals([(
+                    request_from.astimezone(tz), request_to.astimezone(tz),
+                    self.env['resource.calendar.attendance'])])
+                day_hours = defaultdict(float)
+                for start, stop, meta in request_intervals:
+                    day_hours[start.date()] += (
+                        stop - start).total_seconds() / 3600
+                day_total = day_totals[resource.id]
+                # compute number of days as quarters
+                days = sum(
+                    float_utils.round(ROUNDING_FACTOR * day_hours[day] /
+                                      day_total[day]) / ROUNDING_FACTOR
+                    for day in day_hours
+                )
+                result[index] = {
+                    'days': days,
+                    'hours': sum(day_hours.values()),
+                }
+        return result
@@ -48,9 +48,24 @@ class HrPayslipEmployees(models.TransientModel):
         if not data['employee_ids']:
             raise UserError(
                 _("You must select employee(s) to generate payslip(s)."))
-        for employee in self.env['hr.employee'].browse(data['employee_ids']):
+        employees = self.env['hr.employee'].browse(data['employee_ids'])
+        # compute the worked days of every employee in one batched pass,
+        # served to onchange_employee_id through the context
+        contracts = self.env['hr.contract'].browse([
+            contract_id for employee in employees
+            for contract_id in self.env['hr.payslip'].get_contract(
+                employee, from_date, to_date)])
+        worked_day_lines = {contract_id: [] for contract_id in contracts.ids}
+        for line in self.env['hr.payslip'].get_worked_day_lines(
+                contracts, from_date, to_date):
+            worked_day_lines[line['contract_id']].append(line)
+        payslip_model = self.env['hr.payslip'].with_context(
+            payslip_worked_day_lines=worked_day_lines,
+            **self.env['hr.payslip']._get_inputs_prefetch(
+                employees, from_date, to_date))
+        for employee in employees:
             slip_data = (
-                self.env['hr.payslip'].onchange_employee_id(
+                payslip_model.onchange_employee_id(
                     from_date, to_date, employee.id, contract_id=False))
             res = {
                 'employee_id': employee.id,
@@ -30,35 +30,13 @@ class Reminders(http.Controller):
     reminders"""
     @http.route('/hr_reminder/all_reminder', type='json', auth="public")
     def all_reminder(self):
-        """Method all_reminder returns the records of the all reminders in the
-        model HR Reminder."""
-        reminders = []
-        for reminder in request.env['hr.reminder'].search([]):
-            if reminder.search_by == 'today':
-                reminders.append({
-                    'id': reminder.id,
-                    'name': reminder.name
-                })
-            elif reminder.search_by == 'set_period':
-                if (fields.date.today() >=
-                        reminder.date_from and fields.date.today()
-                        <= reminder.date_to and (
-                        not reminder.expiry_date or fields.date.today()
-                        <= reminder.expiry_date)):
-                    reminders.append({
-                        'id': reminder.id,
-                        'name': reminder.name
-                    })
-            else:
-                if fields.date.today() >= reminder.date_set - timedelta(
-                        days=reminder.days_before) and (
-                        not reminder.expiry_date or fields.date.today()
-                        <= reminder.expiry_date):
-                    reminders.append({
-                        'id': reminder.id,
-                        'name': reminder.name
-                    })
-        return reminders
+        """Method all_reminder returns the reminders active today, served
+        from a cache refreshed every day."""
+        reminder_model = request.env['hr.reminder']
+        reminder_model.check_access('read')
+        return [{'id': reminder_id, 'name': name}
+                for reminder_id, name in reminder_model._get_active_reminders(
+                    fields.Date.today(), request.env.user.company_id.id)]
 
     @http.route('/hr_reminder/reminder_active', type='json', auth="public")
     def reminder_active(self, **kwargs):
@@ -20,7 +20,8 @@
 #    If not, see <http://www.gnu.org/licenses/>.
 #
 #############################################################################
-from odoo import models, fields
+from datetime import timedelta
+from odoo import api, fields, models, tools
 
 
 class HrReminder(models.Model):
@@ -58,3 +59,60 @@ class HrReminder(models.Model):
     company_id = fields.Many2one('res.company', string='Company',
                                  required=True, help="Company of the record",
                                  default=lambda self: self.env.user.company_id)
+    active_date_from = fields.Date(
+        string="Active From", compute='_compute_active_window', store=True,
+        index=True, help="First day the reminder is shown, unbounded if empty")
+    active_date_to = fields.Date(
+        string="Active To", compute='_compute_active_window', store=True,
+        index=True, help="Last day the reminder is shown, unbounded if empty")
+
+    @api.depends('search_by', 'date_set', 'days_before', 'date_from',
+                 'date_to', 'expiry_date')
+    def _compute_active_window(self):
+        """Compute the days the reminder is shown in the systray."""
+        for reminder in self:
+            date_from = date_to = False
+            if reminder.search_by == 'set_period':
+                date_from = reminder.date_from
+                date_to = min(filter(None, [reminder.date_to,
+                                            reminder.expiry_date]),
+                              default=False)
+            elif reminder.search_by == 'set_date':
+                date_from = reminder.date_set and reminder.date_set - \
+                    timedelta(days=reminder.days_before)
+                date_to = reminder.expiry_date
+            reminder.active_date_from = date_from
+            reminder.active_date_to = date_to
+
+    @api.model
+    @tools.ormcache('day', 'company_id')
+    def _get_active_reminders(self, day, company_id):
+        """Return the id and name of the reminders shown on the given day
+        to the users of the given company, with a single indexed query. The
+        entries of the previous days are never read again and are evicted
+        from the cache as it fills."""
+        reminders = self.sudo().search_fetch([
+            '|', ('active_date_from', '=', False),
+            ('active_date_from', '<=', day),
+            '|', ('active_date_to', '=', False),
+            ('active_date_to', '>=', day),
+            '|', ('company_id', '=', False),
+            ('company_id', 'child_of', [company_id]),
+        ], ['name'])
+        return tuple((reminder.id, reminder.name) for reminder in reminders)
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        reminders = super().create(vals_list)
+        self.env.registry.clear_cache()
+        return reminders
+
+    def write(self, vals):
+        res = super().write(vals)
+        self.env.registry.clear_cache()
+        return res
+
+    def unlink(self):
+        res = super().unlink()
+        self.env.registry.clear_cache()
+        return res
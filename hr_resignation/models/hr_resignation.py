@@ -20,6 +20,7 @@
 #    If not, see <http://www.gnu.org/licenses/>.
 #
 #############################################################################
+from collections import defaultdict
 from datetime import timedelta
 from odoo import api, fields, models, _
 from odoo.exceptions import ValidationError
@@ -27,6 +28,8 @@ from odoo.exceptions import ValidationError
 date_format = "%Y-%m-%d"
 RESIGNATION_TYPE = [('resigned', 'Normal Resignation'),
                     ('fired', 'Fired by the company')]
+# Departure reason set on the employees, by resignation type
+DEPARTURE_REASONS = {'resigned': 'Resigned', 'fired': 'Fired'}
 
 
 class HrResignation(models.Model):
@@ -105,30 +108,24 @@ class HrResignation(models.Model):
         """ Check if there is an active resignation request for the
             same employee with a confirmed or approved state, based on the
             'joined_date' of the current resignation."""
-        for resignation in self:
-            resignation_request = self.env['hr.resignation'].search(
-                [('employee_id', '=', resignation.employee_id.id),
-                 ('state', 'in', ['confirm', 'approved'])])
-            if resignation_request:
-                raise ValidationError(
-                    _('There is a resignation request in confirmed or'
-                      ' approved state for this employee'))
+        if self.env['hr.resignation'].search_count(
+                [('employee_id', 'in', self.employee_id.ids),
+                 ('state', 'in', ['confirm', 'approved'])], limit=1):
+            raise ValidationError(
+                _('There is a resignation request in confirmed or'
+                  ' approved state for this employee'))
 
     @api.onchange('employee_id')
     def _onchange_employee_id(self):
         """ Method triggered when the 'employee_id' field is changed."""
         self.joined_date = self.employee_id.joining_date
         if self.employee_id:
-            resignation_request = self.env['hr.resignation'].search(
-                [('employee_id', '=', self.employee_id.id),
-                 ('state', 'in', ['confirm', 'approved'])])
-            if resignation_request:
+            prefetch = self._get_departure_prefetch(self.employee_id)
+            if prefetch['pending_resignations']:
                 raise ValidationError(
                     _('There is a resignation request in confirmed or'
                       ' approved state for this employee'))
-            employee_contract = self.env['hr.contract'].search(
-                [('employee_id', '=', self.employee_id.id)])
-            for contracts in employee_contract:
+            for contracts in prefetch['contracts'].get(self.employee_id, []):
                 if contracts.state == 'open':
                     self.employee_contract = contracts.name
                     self.notice_period = contracts.notice_days
@@ -181,57 +178,84 @@ class HrResignation(models.Model):
     def action_approve_resignation(self):
         """ Method triggered by the 'Approve' button to
                approve the resignation."""
+        if any(not (resignation.expected_revealing_date and
+                    resignation.resign_confirm_date)
+               for resignation in self):
+            raise ValidationError(_('Please Enter Valid Dates.'))
+        prefetch = self._get_departure_prefetch(self.employee_id)
+        contracts_to_cancel = self.env['hr.contract']
+        departures = self.env['hr.resignation']
         for resignation in self:
-            if (resignation.expected_revealing_date and
-                    resignation.resign_confirm_date):
-                employee_contract = self.env['hr.contract'].search(
-                    [('employee_id', '=', self.employee_id.id)])
-                if not employee_contract:
-                    raise ValidationError(
-                        _("There are no Contracts found for this employee"))
-                for contract in employee_contract:
-                    if contract.state == 'open':
-                        resignation.employee_contract = contract.name
-                        resignation.state = 'approved'
-                        resignation.approved_revealing_date = (
+            employee_contract = prefetch['contracts'].get(
+                resignation.employee_id)
+            if not employee_contract:
+                raise ValidationError(
+                    _("There are no Contracts found for this employee"))
+            vals = {}
+            for contract in employee_contract:
+                if contract.state == 'open':
+                    vals.update({
+                        'employee_contract': contract.name,
+                        'state': 'approved',
+                        'approved_revealing_date': (
                                 resignation.resign_confirm_date + timedelta(
-                            days=contract.notice_days))
-                    else:
-                        resignation.approved_revealing_date = (
-                            resignation.expected_revealing_date)
-                    # Cancelling contract
-                    contract.state = 'cancel' if contract.state == "open" else \
-                        contract.state
-                # Changing state of the employee if resigning today
-                if (resignation.expected_revealing_date <= fields.Date.today()
-                        and resignation.employee_id.active):
-                    resignation.employee_id.active = False
-                    # Changing fields in the employee table
-                    # with respect to resignation
-                    resignation.employee_id.resign_date = (
+                            days=contract.notice_days)),
+                    })
+                    contracts_to_cancel |= contract
+                else:
+                    vals['approved_revealing_date'] = (
                         resignation.expected_revealing_date)
-                    if resignation.resignation_type == 'resigned':
-                        resignation.employee_id.resigned = True
-                        departure_reason_id = self.env[
-                            'hr.departure.reason'].search(
-                            [('name', '=', 'Resigned')])
-                    else:
-                        resignation.employee_id.fired = True
-                        departure_reason_id = self.env[
-                            'hr.departure.reason'].search(
-                            [('name', '=', 'Fired')])
-                    running_contract_ids = self.env['hr.contract'].search([
-                        ('employee_id', '=', resignation.employee_id.id),
-                        ('company_id', '=', resignation.employee_id.company_id.id),
-                        ('state', '=', 'open'),
-                    ]).filtered(lambda c: c.date_start <= fields.Date.today() and (
-                                not c.date_end or c.date_end >= fields.Date.today()))
-                    running_contract_ids.state = 'close'
-                    resignation.employee_id.departure_reason_id = departure_reason_id
-                    resignation.employee_id.departure_date = resignation.approved_revealing_date
-                    # Removing and deactivating user
-                    if resignation.employee_id.user_id:
-                        resignation.employee_id.user_id.active = False
-                        resignation.employee_id.user_id = None
-            else:
-                raise ValidationError(_('Please Enter Valid Dates.'))
+            resignation.write(vals)
+            # Changing state of the employee if resigning today
+            if (resignation.expected_revealing_date <= fields.Date.today()
+                    and resignation.employee_id.active):
+                departures |= resignation
+        # Cancelling contracts
+        contracts_to_cancel.write({'state': 'cancel'})
+        departures._apply_departures(prefetch['departure_reasons'])
+
+    def _get_departure_prefetch(self, employees):
+        """ Return the contracts and the confirmed or approved resignations
+        of the employees, grouped by employee, and the departure reasons by
+        name, each read with one query for all the employees."""
+        contracts = self.env['hr.contract'].search(
+            [('employee_id', 'in', employees.ids)])
+        pending_resignations = self.env['hr.resignation'].search(
+            [('employee_id', 'in', employees.ids),
+             ('state', 'in', ['confirm', 'approved'])])
+        departure_reasons = {}
+        for reason in self.env['hr.departure.reason'].search(
+                [('name', 'in', list(DEPARTURE_REASONS.values()))]):
+            departure_reasons.setdefault(reason.name, reason)
+        return {
+            'contracts': contracts.grouped('employee_id'),
+            'pending_resignations': pending_resignations.grouped(
+                'employee_id'),
+            'departure_reasons': departure_reasons,
+        }
+
+    def _apply_departures(self, departure_reasons):
+        """ Archive the employees of the resignations and their users, with
+        one write per set of identical values."""
+        employee_vals = defaultdict(lambda: self.env['hr.employee'])
+        for resignation in self:
+            # Changing fields in the employee table
+            # with respect to resignation
+            resignation_type = ('resigned' if resignation.resignation_type ==
+                                'resigned' else 'fired')
+            reason = departure_reasons.get(DEPARTURE_REASONS[resignation_type])
+            vals = (
+                ('active', False),
+                ('resign_date', resignation.expected_revealing_date),
+                (resignation_type, True),
+                ('departure_reason_id', reason.id if reason else False),
+                ('departure_date', resignation.approved_revealing_date),
+            )
+            employee_vals[vals] |= resignation.employee_id
+        for vals, employees in employee_vals.items():
+            employees.write(dict(vals))
+        # Removing and deactivating users
+        employees = self.employee_id.filtered('user_id')
+        if employees:
+            employees.user_id.write({'active': False})
+            employees.write({'user_id': False})
@@ -21,4 +21,5 @@
 #
 #############################################################################
 from . import hr_announcement
+from . import hr_announcement_audience
 from . import hr_employee
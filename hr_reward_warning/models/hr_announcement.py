@@ -83,6 +83,10 @@ class HrAnnouncement(models.Model):
                              required=True, help="Start date of announcement")
     date_end = fields.Date(string='End Date', default=fields.Date.today(),
                            required=True, help="End date of announcement")
+    audience_ids = fields.One2many('hr.announcement.audience',
+                                   'announcement_id', string='Audience',
+                                   help="Employees who can see this "
+                                        "announcement")
 
     @api.constrains('date_start', 'date_end')
     def _check_date_start(self):
@@ -120,9 +124,7 @@ class HrAnnouncement(models.Model):
         Expire announcements based on their End date, triggered by a
         scheduled cron job.
         """
-        announcements = self.search([('state', '!=', 'rejected')])
-        for announcement in announcements:
-            if announcement.date_end < fields.Date.today():
-                announcement.write({
-                    'state': 'expired'
-                })
+        self.search([
+            ('state', 'not in', ('rejected', 'expired')),
+            ('date_end', '<', fields.Date.today()),
+        ]).write({'state': 'expired'})
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+#############################################################################
+#    A part of Open HRMS Project <https://www.openhrms.com>
+#
+#    Cybrosys Technologies Pvt. Ltd.
+#
+#    Copyright (C) 2024-TODAY Cybrosys Technologies(<https://www.cybrosys.com>)
+#    Author: Cybrosys Techno Solutions(<https://www.cybrosys.com>)
+#
+#    You can modify it under the terms of the GNU LESSER
+#    GENERAL PUBLIC LICENSE (LGPL v3), Version 3.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU LESSER GENERAL PUBLIC LICENSE (LGPL v3) for more details.
+#
+#    You should have received a copy of the GNU LESSER GENERAL PUBLIC LICENSE
+#    (LGPL v3) along with this program.
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+#############################################################################
+from odoo import fields, models, tools
+
+
+class HrAnnouncementAudience(models.Model):
+    """ Employees who can see each announcement, whether they are selected
+    directly or through their department or job position. General
+    announcements are visible to everybody and are not listed here."""
+    _name = 'hr.announcement.audience'
+    _description = 'HR Announcement Audience'
+    _auto = False
+
+    announcement_id = fields.Many2one('hr.announcement',
+                                      string='Announcement', readonly=True,
+                                      help="Announcement visible to the "
+                                           "employee")
+    employee_id = fields.Many2one('hr.employee', string='Employee',
+                                  readonly=True,
+                                  help="Employee who can see the "
+                                       "announcement")
+
+    def init(self):
+        """ Create the view listing the audience of the announcements """
+        tools.drop_view_if_exists(self.env.cr, self._table)
+        self.env.cr.execute("""
+            CREATE OR REPLACE VIEW %s AS (
+                SELECT (audience.announcement_id::bigint << 32)
+                           | audience.employee_id AS id,
+                       audience.announcement_id,
+                       audience.employee_id
+                  FROM (
+                        SELECT announcement AS announcement_id,
+                               employee AS employee_id
+                          FROM hr_employee_announcements
+                         UNION
+                        SELECT rel.announcement, employee.id
+                          FROM hr_department_announcements rel
+                          JOIN hr_employee employee
+                            ON employee.department_id = rel.department
+                         UNION
+                        SELECT rel.announcement, employee.id
+                          FROM hr_job_position_announcements rel
+                          JOIN hr_employee employee
+                            ON employee.job_id = rel.job_position
+                  ) audience
+            )""" % self._table)
@@ -33,55 +33,31 @@ class HrEmployee(models.Model):
                                         help="Count of Announcements")
 
     def _compute_announcement_count(self):
-        """ Compute announcement count for an employee """
+        """ Compute announcement count for the employees, from the general
+        announcements and one grouped query on the announcement audience """
+        today = fields.Date.today()
+        general_count = self.env['hr.announcement'].sudo().search_count(
+            [('is_announcement', '=', True),
+             ('state', '=', 'approved'),
+             ('date_start', '<=', today)])
+        audience_counts = dict(self.env[
+            'hr.announcement.audience'].sudo()._read_group(
+            [('employee_id', 'in', self._origin.ids),
+             ('announcement_id.is_announcement', '=', False),
+             ('announcement_id.state', '=', 'approved'),
+             ('announcement_id.date_start', '<=', today)],
+            ['employee_id'], ['__count']))
         for employee in self:
-            announcement_ids_general = self.env[
-                'hr.announcement'].sudo().search_count(
-                [('is_announcement', '=', True),
-                 ('state', '=', 'approved'),
-                 ('date_start', '<=', fields.Date.today())])
-            announcement_ids_emp = (self.env['hr.announcement'].
-            sudo().search_count(
-                [('employee_ids', 'in', self.id),
-                 ('state', '=', 'approved'),
-                 ('date_start', '<=', fields.Date.today())]))
-            announcement_ids_dep = (self.env['hr.announcement'].
-            sudo().search_count(
-                [('department_ids', 'in', self.department_id.id),
-                 ('state', '=', 'approved'),
-                 ('date_start', '<=', fields.Date.today())]))
-            announcement_ids_job = (self.env['hr.announcement'].
-            sudo().search_count(
-                [('position_ids', 'in', self.job_id.id),
-                 ('state', '=', 'approved'),
-                 ('date_start', '<=', fields.Date.today())]))
-            employee.announcement_count = (announcement_ids_general +
-                                           announcement_ids_emp +
-                                           announcement_ids_dep +
-                                           announcement_ids_job)
+            employee.announcement_count = (
+                general_count + audience_counts.get(employee._origin, 0))
 
     def action_open_announcements(self):
         """ Open a view displaying announcements related to the employee. """
-        announcement_ids_general = self.env[
-            'hr.announcement'].sudo().search(
-            [('is_announcement', '=', True),
-             ('state', '=', 'approved'),
-             ('date_start', '<=', fields.Date.today())])
-        announcement_ids_emp = self.env['hr.announcement'].sudo().search(
-            [('employee_ids', 'in', self.id),
-             ('state', '=', 'approved'),
-             ('date_start', '<=', fields.Date.today())])
-        announcement_ids_dep = self.env['hr.announcement'].sudo().search(
-            [('department_ids', 'in', self.department_id.id),
-             ('state', '=', 'approved'),
-             ('date_start', '<=', fields.Date.today())])
-        announcement_ids_job = self.env['hr.announcement'].sudo().search(
-            [('position_ids', 'in', self.job_id.id),
+        announcement_ids = self.env['hr.announcement'].sudo().search(
+            ['|', ('is_announcement', '=', True),
+             ('audience_ids.employee_id', '=', self.id),
              ('state', '=', 'approved'),
-             ('date_start', '<=', fields.Date.today())])
-        announcement_ids = (announcement_ids_general.ids +
-                            announcement_ids_emp.ids +
-                            announcement_ids_job.ids + announcement_ids_dep.ids)
+             ('date_start', '<=', fields.Date.today())]).ids
         view_id = self.env.ref('hr_reward_warning.hr_announcement_view_form').id
         if announcement_ids:
             if len(announcement_ids) > 1:
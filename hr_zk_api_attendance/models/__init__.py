@@ -2,4 +2,5 @@ from . import zk_api
 from . import zk_attendance
 from . import zk_department
 from . import hr_attendance
-from . import zk_employee
\ No newline at end of file
+from . import zk_employee
+from . import hr_employee
\ No newline at end of file
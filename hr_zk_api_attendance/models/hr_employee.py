@@ -0,0 +1,51 @@
+from odoo import models, api, tools
+
+
+class HrEmployee(models.Model):
+    _inherit = 'hr.employee'
+
+    @api.model
+    @tools.ormcache()
+    def _get_pin_employee_mapping(self):
+        """Return a frozendict {(company id, pin): employee id} of the active
+        employees, cached at registry level and shared by the ZK records."""
+        employees = self.sudo().search_fetch([('pin', '!=', False)], ['pin', 'company_id'], order='id desc')
+        return tools.frozendict(
+            ((employee.company_id.id, employee.pin), employee.id) for employee in employees)
+
+    @api.model
+    def _get_employee_ids_by_pin(self, pins, companies=None):
+        """Return a dict {pin: employee id} for the given pins having an
+        employee in the companies, the allowed companies by default. A PIN
+        used in several companies resolves to the current company first."""
+        companies = companies or self.env.companies
+        company_ids = sorted(companies.ids, key=lambda company_id: company_id != self.env.company.id)
+        mapping = self._get_pin_employee_mapping()
+        employee_ids = {}
+        for pin in pins:
+            for company_id in company_ids:
+                if (company_id, pin) in mapping:
+                    employee_ids[pin] = mapping[company_id, pin]
+                    break
+        return employee_ids
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        employees = super().create(vals_list)
+        if any(vals.get('pin') for vals in vals_list):
+            self.env.registry.clear_cache()
+        return employees
+
+    def write(self, vals):
+        clear_cache = 'pin' in vals or (('active' in vals or 'company_id' in vals) and any(self.mapped('pin')))
+        res = super().write(vals)
+        if clear_cache:
+            self.env.registry.clear_cache()
+        return res
+
+    def unlink(self):
+        clear_cache = any(self.mapped('pin'))
+        res = super().unlink()
+        if clear_cache:
+            self.env.registry.clear_cache()
+        return res
@@ -29,9 +29,7 @@ class ZkAttendance(models.Model):
     
     @api.depends('emp_code')
     def _compute_employee_id(self):
-        employees_codes = self.mapped('emp_code')
-        employees = self.env['hr.employee'].search([('pin', 'in', employees_codes)])
-        mapped_employees = {emp.pin: emp.id for emp in employees}
+        mapped_employees = self.env['hr.employee']._get_employee_ids_by_pin(self.mapped('emp_code'))
         for record in self:
             record.employee_id = mapped_employees.get(record.emp_code, False)
 
@@ -22,9 +22,7 @@ class ZkEmployee(models.Model):
 
     @api.depends('emp_code')
     def _compute_employee_id(self):
-        employees_codes = self.mapped('emp_code')
-        employees = self.env['hr.employee'].search([('pin', 'in', employees_codes)])
-        mapped_employees = {emp.pin: emp.id for emp in employees}
+        mapped_employees = self.env['hr.employee']._get_employee_ids_by_pin(self.mapped('emp_code'))
         for record in self:
             record.employee_id = mapped_employees.get(record.emp_code, False)
 
@@ -81,8 +79,7 @@ class ZkEmployee(models.Model):
 
     def __create_hr_employees(self):
         not_linked = self.filtered(lambda r: not r.employee_id)
-        existing_employees = self.env['hr.employee'].search([('pin', 'in', not_linked.mapped('emp_code'))])
-        existing_codes = existing_employees.mapped('pin')
+        existing_codes = self.env['hr.employee']._get_employee_ids_by_pin(not_linked.mapped('emp_code'))
         not_linked = not_linked.filtered(lambda r: r.emp_code not in existing_codes)
         vals_list = []
         for record in not_linked:
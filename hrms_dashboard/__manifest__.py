@@ -35,11 +35,9 @@
                 'hr_attendance', 'hr_timesheet_attendance',
                 'hr_recruitment', 'hr_resignation', 'event',
                 'hr_reward_warning','hr_expense'],
-    'external_dependencies': {
-        'python': ['pandas'],
-    },
     'data': [
         'security/ir.model.access.csv',
+        'data/ir_cron_data.xml',
         'report/broadfactor.xml',
         'views/hr_leave_views.xml',
         'views/hrms_dashboard_menus.xml',
@@ -23,4 +23,5 @@
 from . import hr_employee
 from . import hr_employee_base
 from . import hr_leave
+from . import hr_leave_dashboard_snapshot
 from . import hr_leave_type
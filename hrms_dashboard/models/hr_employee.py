@@ -20,17 +20,11 @@
 #    If not, see <http://www.gnu.org/licenses/>.
 #
 #############################################################################
-import pandas as pd
-from collections import defaultdict
 from datetime import timedelta, datetime, date
 from dateutil.relativedelta import relativedelta
 from odoo import api, fields, models, _
 from odoo.http import request
-from odoo.tools import float_utils
 from odoo.tools import format_duration
-from pytz import utc
-
-ROUNDING_FACTOR = 16
 
 
 class HrEmployee(models.Model):
@@ -39,6 +33,29 @@ class HrEmployee(models.Model):
 
     birthday = fields.Date(string='Date of Birth', groups="base.group_user",
                            help="Birthday of employee")
+    dashboard_leave_dirty = fields.Boolean(
+        string='Dashboard Leave Snapshot Outdated', default=True, copy=False,
+        groups="hr.group_hr_user",
+        help="Set when the leaves or the working schedule of the employee "
+             "changed since the last refresh of the dashboard leave snapshot")
+
+    def write(self, vals):
+        """Flag the employees for a dashboard snapshot refresh when their
+        company or working schedule changes"""
+        res = super().write(vals)
+        if 'company_id' in vals or 'resource_calendar_id' in vals:
+            self._mark_dashboard_leave_dirty()
+        return res
+
+    def _mark_dashboard_leave_dirty(self):
+        """Flag the employees for a dashboard leave snapshot refresh.
+        Done in SQL to leave the write date of the employees untouched."""
+        if not self.ids:
+            return
+        self.env.cr.execute("""
+            UPDATE hr_employee SET dashboard_leave_dirty = TRUE
+            WHERE id in %s""", (tuple(self.ids),))
+        self.invalidate_recordset(['dashboard_leave_dirty'])
 
     def attendance_manual(self):
         """Create and update an attendance for the user employee"""
@@ -283,50 +300,18 @@ class HrEmployee(models.Model):
                 'leave': leave
             }
             graph_result.append(vals)
-        sql = """
-        SELECT h.id, h.employee_id,h.department_id
-             , extract('month' FROM y)::int AS leave_month
-             , to_char(y, 'Month YYYY') as month_year
-             , GREATEST(y                    , h.date_from) AS date_from
-             , LEAST   (y + interval '1 month', h.date_to)   AS date_to
-        FROM  (select * from hr_leave where state = 'validate') h
-             , generate_series(date_trunc('month', date_from::timestamp)
-                             , date_trunc('month', date_to::timestamp)
-                             , interval '1 month') y
-        where date_trunc('month', GREATEST(y , h.date_from)) >= 
-        date_trunc('month', now()) - interval '6 month' and
-        date_trunc('month', GREATEST(y , h.date_from)) <= 
-        date_trunc('month', now())
-        and h.department_id is not null
-        """
-        self.env.cr.execute(sql)
-        results = self.env.cr.dictfetchall()
-        leave_lines = []
-        for line in results:
-            employee = self.browse(line['employee_id'])
-            from_dt = fields.Datetime.from_string(line['date_from'])
-            to_dt = fields.Datetime.from_string(line['date_to'])
-            days = employee.get_work_days_dashboard(from_dt, to_dt)
-            line['days'] = days
-            vals = {
-                'department': line['department_id'],
-                'l_month': line['month_year'],
-                'days': days
-            }
-            leave_lines.append(vals)
-        if leave_lines:
-            df = pd.DataFrame(leave_lines)
-            rf = df.groupby(['l_month', 'department']).sum()
-            result_lines = rf.to_dict('index')
-            for month in month_list:
-                for line in result_lines:
-                    if month.replace(' ', '') == line[0].replace(' ', ''):
-                        match = list(filter(lambda d: d['l_month'] in [month],
-                                            graph_result))[0]['leave']
-                        dept_name = self.env['hr.department'].browse(
-                            line[1]).name
-                        if match:
-                            match[dept_name] = result_lines[line]['days']
+        department_names = {dept['id']: list(dept['name'].values())[0]
+                            for dept in departments}
+        month_starts = self.env['hr.leave.dashboard.snapshot'].\
+            _get_month_starts()
+        leave_groups = self.env['hr.leave.dashboard.snapshot'].sudo()._read_group(
+            [('company_id', 'in', self.env.companies.ids),
+             ('department_id', 'in', list(department_names)),
+             ('month', 'in', month_starts)],
+            ['month:day', 'department_id'], ['days:sum'])
+        for month, department, days in leave_groups:
+            graph_result[month_starts.index(month)]['leave'][
+                department_names[department.id]] = days
         for result in graph_result:
             result['l_month'] = result['l_month'].split(' ')[:1][0].strip()[
                                 :3] + " " + \
@@ -338,41 +323,13 @@ class HrEmployee(models.Model):
                                 compute_leaves=False, calendar=None,
                                 domain=None):
         """Calculate employee worked hours/day details"""
-        resource = self.resource_id
-        calendar = calendar or self.resource_calendar_id
-        if not from_datetime.tzinfo:
-            from_datetime = from_datetime.replace(tzinfo=utc)
-        if not to_datetime.tzinfo:
-            to_datetime = to_datetime.replace(tzinfo=utc)
-        from_full = from_datetime - timedelta(days=1)
-        to_full = to_datetime + timedelta(days=1)
-        intervals = calendar._attendance_intervals_batch(from_full, to_full,
-                                                         resource)
-        day_total = defaultdict(float)
-        for start, stop, meta in intervals[resource.id]:
-            day_total[start.date()] += (stop - start).total_seconds() / 3600
-        if compute_leaves:
-            intervals = calendar._work_intervals_batch(from_datetime,
-                                                       to_datetime, resource,
-                                                       domain)
-        else:
-            intervals = calendar._attendance_intervals_batch(from_datetime,
-                                                             to_datetime,
-                                                             resource)
-        day_hours = defaultdict(float)
-        for start, stop, meta in intervals[resource.id]:
-            day_hours[start.date()] += (stop - start).total_seconds() / 3600
-        days = sum(
-            float_utils.round(ROUNDING_FACTOR * day_hours[day] / day_total[
-                day]) / ROUNDING_FACTOR
-            for day in day_hours
-        )
-        return days
+        return self._get_work_days_data_batch(
+            [(self, from_datetime, to_datetime, calendar)],
+            compute_leaves=compute_leaves, domain=domain)[0]['days']
 
     @api.model
     def employee_leave_trend(self):
         """Logged employee monthly wise leave information"""
-        leave_lines = []
         month_list = []
         graph_result = []
         for i in range(5, -1, -1):
@@ -388,44 +345,14 @@ class HrEmployee(models.Model):
                 'leave': 0
             }
             graph_result.append(vals)
-        sql = """
-                SELECT h.id, h.employee_id
-                     , extract('month' FROM y)::int AS leave_month
-                     , to_char(y, 'Month YYYY') as month_year
-                     , GREATEST(y                    , h.date_from) AS date_from
-                     , LEAST   (y + interval '1 month', h.date_to)   AS date_to
-                FROM  (select * from hr_leave where state = 'validate') h
-                     , generate_series(date_trunc('month', date_from::timestamp)
-                                     , date_trunc('month', date_to::timestamp)
-                                     , interval '1 month') y
-                where date_trunc('month', GREATEST(y , h.date_from)) >= 
-                date_trunc('month', now()) - interval '6 month' and
-                date_trunc('month', GREATEST(y , h.date_from)) <= 
-                date_trunc('month', now()) and h.employee_id = %s """
-        self.env.cr.execute(sql, (employee[0]['id'],))
-        results = self.env.cr.dictfetchall()
-        for line in results:
-            employee = self.browse(line['employee_id'])
-            from_dt = fields.Datetime.from_string(line['date_from'])
-            to_dt = fields.Datetime.from_string(line['date_to'])
-            days = employee.get_work_days_dashboard(from_dt, to_dt)
-            line['days'] = days
-            vals = {
-                'l_month': line['month_year'],
-                'days': days
-            }
-            leave_lines.append(vals)
-        if leave_lines:
-            df = pd.DataFrame(leave_lines)
-            rf = df.groupby(['l_month']).sum()
-            result_lines = rf.to_dict('index')
-            for line in result_lines:
-                match = list(filter(
-                    lambda d: d['l_month'].replace(' ', '') == line.replace(' ',
-                                                                            ''),
-                    graph_result))
-                if match:
-                    match[0]['leave'] = result_lines[line]['days']
+        month_starts = self.env['hr.leave.dashboard.snapshot'].\
+            _get_month_starts()
+        leave_groups = self.env['hr.leave.dashboard.snapshot'].sudo()._read_group(
+            [('employee_id', '=', employee[0]['id']),
+             ('month', 'in', month_starts)],
+            ['month:day'], ['days:sum'])
+        for month, days in leave_groups:
+            graph_result[month_starts.index(month)]['leave'] = days
         for result in graph_result:
             result['l_month'] = result['l_month'].split(' ')[:1][0].strip()[
                                 :3] + " " + \
@@ -502,19 +429,17 @@ class HrEmployee(models.Model):
         monthly_join_resign = self.join_resign_trends()
         month_join = monthly_join_resign[0]['values']
         month_resign = monthly_join_resign[1]['values']
-        sql = """
-        SELECT (date_trunc('month', CURRENT_DATE))::date - interval '1' 
-        month * s.a AS month_start
-        FROM generate_series(0,11,1) AS s(a);"""
-        self._cr.execute(sql)
-        month_start_list = self._cr.fetchall()
-        for month_date in month_start_list:
-            self._cr.execute("""select count(id), 
-            to_char(date '%s', 'Month YYYY') as l_month from hr_employee
-            where resign_date> date '%s' or resign_date is null and 
-            joining_date < date '%s'
-            """ % (month_date[0], month_date[0], month_date[0],))
-            month_emp = self._cr.fetchone()
+        self._cr.execute("""
+        SELECT count(e.id), to_char(m.month_start, 'Month YYYY') as l_month
+        FROM (SELECT (date_trunc('month', CURRENT_DATE))::date - interval '1'
+              month * s.a AS month_start
+              FROM generate_series(0,11,1) AS s(a)) m
+        LEFT JOIN hr_employee e
+        ON e.resign_date > m.month_start or e.resign_date is null and
+        e.joining_date < m.month_start
+        GROUP BY m.month_start
+        ORDER BY m.month_start DESC""")
+        for month_emp in self._cr.fetchall():
             match_join = \
                 list(filter(
                     lambda d: d['l_month'] == month_emp[1].split(' ')[:1][
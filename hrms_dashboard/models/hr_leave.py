@@ -20,7 +20,11 @@
 #    If not, see <http://www.gnu.org/licenses/>.
 #
 #############################################################################
-from odoo import fields, models
+from odoo import api, fields, models
+
+# Leave fields affecting the dashboard leave snapshot
+DASHBOARD_LEAVE_FIELDS = {'state', 'date_from', 'date_to', 'employee_id',
+                          'department_id'}
 
 
 class HrLeave(models.Model):
@@ -32,3 +36,25 @@ class HrLeave(models.Model):
         store=True, help="Field allowing to see the leave request duration "
                          "in days or hours depending on the "
                          "leave_type_request_unit")
+
+    @api.model_create_multi
+    def create(self, vals_list):
+        """Flag the employees of the new leaves for a snapshot refresh"""
+        leaves = super().create(vals_list)
+        leaves.employee_id._mark_dashboard_leave_dirty()
+        return leaves
+
+    def write(self, vals):
+        """Flag the employees of the leaves, before and after the update, for
+        a snapshot refresh"""
+        if not DASHBOARD_LEAVE_FIELDS.intersection(vals):
+            return super().write(vals)
+        employees = self.employee_id
+        res = super().write(vals)
+        (employees | self.employee_id)._mark_dashboard_leave_dirty()
+        return res
+
+    def unlink(self):
+        """Flag the employees of the removed leaves for a snapshot refresh"""
+        self.employee_id._mark_dashboard_leave_dirty()
+        return super().unlink()
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+#############################################################################
+#    A part of Open HRMS Project <https://www.openhrms.com>
+#
+#    Cybrosys Technologies Pvt. Ltd.
+#
+#    Copyright (C) 2024-TODAY Cybrosys Technologies(<https://www.cybrosys.com>)
+#    Author: Cybrosys Techno Solutions(<https://www.cybrosys.com>)
+#
+#    You can modify it under the terms of the GNU LESSER
+#    GENERAL PUBLIC LICENSE (LGPL v3), Version 3.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU LESSER GENERAL PUBLIC LICENSE (LGPL v3) for more details.
+#
+#    You should have received a copy of the GNU LESSER GENERAL PUBLIC LICENSE
+#    (LGPL v3) along with this program.
+#    If not, see <http://www.gnu.org/licenses/>.
+#
+#############################################################################
+from collections import defaultdict
+from dateutil.relativedelta import relativedelta
+from odoo import api, fields, models
+from odoo.tools import split_every
+
+# Number of months, current one included, shown on the dashboard leave graphs
+DASHBOARD_MONTHS = 6
+
+
+class HrLeaveDashboardSnapshot(models.Model):
+    """ Materialized leave days per employee, department and month used by
+    the dashboard leave graphs. Rows are refreshed by a scheduled action for
+    the employees whose leaves or working schedule changed. """
+    _name = 'hr.leave.dashboard.snapshot'
+    _description = 'HR Dashboard Leave Snapshot'
+    _order = 'month, employee_id'
+
+    company_id = fields.Many2one('res.company', string='Company',
+                                 required=True, index=True,
+                                 help="Company of the employee")
+    employee_id = fields.Many2one('hr.employee', string='Employee',
+                                  required=True, index=True,
+                                  ondelete='cascade',
+                                  help="Employee on leave")
+    department_id = fields.Many2one('hr.department', string='Department',
+                                    ondelete='cascade',
+                                    help="Department of the leave")
+    month = fields.Date(string='Month', required=True, index=True,
+                        help="First day of the month")
+    days = fields.Float(string='Days', help="Leave days taken in the month")
+
+    @api.model
+    def _get_window_start(self):
+        """Return the first day of the oldest month shown on the dashboard"""
+        return fields.Date.today().replace(day=1) - relativedelta(
+            months=DASHBOARD_MONTHS - 1)
+
+    @api.model
+    def _get_month_starts(self):
+        """Return the first day of every month shown on the dashboard"""
+        window_start = self._get_window_start()
+        return [window_start + relativedelta(months=i)
+                for i in range(DASHBOARD_MONTHS)]
+
+    @api.model
+    def _compute_snapshot_values(self, employees):
+        """Return the snapshot rows of the given employees as create values"""
+        window_start = self._get_window_start()
+        self.env.cr.execute("""
+            SELECT h.employee_id, h.department_id, y::date AS month
+                 , GREATEST(y                    , h.date_from) AS date_from
+                 , LEAST   (y + interval '1 month', h.date_to)   AS date_to
+            FROM  (select * from hr_leave where state = 'validate'
+                   and employee_id in %s and date_to >= %s) h
+                 , generate_series(date_trunc('month', date_from::timestamp)
+                                 , date_trunc('month', date_to::timestamp)
+                                 , interval '1 month') y
+            WHERE y >= %s
+        """, (tuple(employees.ids), window_start, window_start))
+        results = [line for line in self.env.cr.dictfetchall()
+                   if employees.browse(line['employee_id']).resource_calendar_id]
+        # work days of every leave month in one batched pass per calendar
+        work_days = self.env['hr.employee']._get_work_days_data_batch(
+            [(employees.browse(line['employee_id']),
+              fields.Datetime.from_string(line['date_from']),
+              fields.Datetime.from_string(line['date_to']), None)
+             for line in results], compute_leaves=False)
+        leave_days = defaultdict(float)
+        for line, work_data in zip(results, work_days):
+            key = (employees.browse(line['employee_id']),
+                   line['department_id'], line['month'])
+            leave_days[key] += work_data['days']
+        return [{
+            'company_id': employee.company_id.id,
+            'employee_id': employee.id,
+            'department_id': department_id,
+            'month': month,
+            'days': days,
+        } for (employee, department_id, month), days in leave_days.items()]
+
+    @api.model
+    def _refresh_employees(self, employees):
+        """Replace the snapshot rows of the given employees"""
+        self.search([('employee_id', 'in', employees.ids)]).unlink()
+        self.create(self._compute_snapshot_values(employees))
+        self.env.cr.execute("""
+            UPDATE hr_employee SET dashboard_leave_dirty = FALSE
+            WHERE id in %s""", (tuple(employees.ids),))
+        employees.invalidate_recordset(['dashboard_leave_dirty'])
+
+    @api.model
+    def _cron_refresh_snapshot(self, batch_size=200):
+        """Refresh the rows of the employees flagged as changed and drop the
+        rows that fell out of the dashboard window"""
+        self.search([('month', '<', self._get_window_start())]).unlink()
+        employees = self.env['hr.employee'].with_context(
+            active_test=False).search([('dashboard_leave_dirty', '=', True)])
+        for batch in split_every(batch_size, employees.ids,
+                                 self.env['hr.employee'].browse):
+            self._refresh_employees(batch)
@@ -1,4 +1,4 @@
-from odoo import models, fields, api
+from odoo import models, fields, api, tools
 
 
 class ResGroups(models.Model):
@@ -22,6 +22,31 @@ class ResGroups(models.Model):
         help="Root menu items that are whitelisted for this group."
     )
 
+    @api.model
+    @tools.ormcache("group_id")
+    def _get_whitelisted_menu_closure(self, group_id):
+        """Return the ids of the menus whitelisted by the group, expanded to
+        their ancestors or descendants depending on ``traversal_as``."""
+        group = self.sudo().browse(group_id)
+        menus = group.whitelisted_menu_ids
+        if group.traversal_as == 'descendants':
+            return frozenset(self.env['ir.ui.menu'].sudo().with_context(**{
+                'ir.ui.menu.full_list': True,
+                'active_test': False,
+            }).search([('id', 'child_of', menus.ids)]).ids)
+        return frozenset(
+            int(menu_id)
+            for parent_path in menus.mapped('parent_path')
+            for menu_id in parent_path.split('/') if menu_id
+        )
+
+    def write(self, vals):
+        res = super().write(vals)
+        if 'whitelisted_menu_ids' in vals or 'traversal_as' in vals:
+            # menu visibility is cached per set of groups, see ir.ui.menu
+            self.env.registry.clear_cache()
+        return res
+
     @api.onchange('traversal_as')
     def _onchange_traversal_as(self):
         """Ensure that whitelisted_menu_ids is cleared when traversal_as changes."""
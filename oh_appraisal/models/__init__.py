@@ -21,4 +21,5 @@
 ###############################################################################
 from . import hr_appraisal
 from . import hr_appraisal_stages
+from . import mail_mail
 from . import survey_user_input
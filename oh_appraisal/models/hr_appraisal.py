@@ -19,6 +19,8 @@
 #    along with this program.  If not, see <https://www.gnu.org/licenses/>.
 #
 ###############################################################################
+from collections import Counter
+
 from odoo import api, fields, models, _
 from odoo.exceptions import ValidationError
 
@@ -176,39 +178,70 @@ class HrAppraisal(models.Model):
         return appraisal_reviewers
 
     def action_start_appraisal(self):
-        """ This function will start the appraisal by sending emails to the
-        corresponding employees specified in the appraisal"""
-        send_count = 0
-        appraisal_reviewers_list = self.fetch_appraisal_reviewer()
-        for appraisal_reviewers, survey_id in appraisal_reviewers_list:
-            for reviewers in appraisal_reviewers:
-                baseurl = self.env['ir.config_parameter'].sudo().get_param(
-                    'web.base.url')
-                response = survey_id._create_answer(survey_id=survey_id.id,
-                                                    deadline=self.appraisal_deadline,
-                                                    partner=reviewers.user_id.partner_id,
-                                                    email=reviewers.work_email,
-                                                    appraisal_id=self.ids[0])
-                url = response.get_start_url()
-                mail_content = "Dear " + reviewers.name + "," + "<br>Please fill out the following survey " \
-                                                                "related to " + self.employee_id.name + "<br>Click here to access the survey.<br>" + \
-                               baseurl + str(
-                    url) + "<br>Post your response for the appraisal till : " \
-                               + str(self.appraisal_deadline)
-                values = {'model': 'hr.appraisal', 'res_id': self.ids[0],
-                          'subject': survey_id.title,
-                          'body_html': mail_content, 'parent_id': None,
-                          'email_from': self.env.user.email or None,
-                          'auto_delete': True, 'email_to': reviewers.work_email}
-                result = self.env['mail.mail'].sudo().create(values)._send()
-                if result is True:
-                    send_count += 1
-                    self.write({'tot_sent_survey': send_count})
-                    rec = self.env['hr.appraisal.stages'].search(
-                        [('sequence', '=', 1)])
-                    self.stage_id = rec.id
-                    self.check_sent = True
-                    self.check_draft = False
+        """ This function will start the appraisal by creating the survey
+        answers of all the reviewers and queuing all their emails at once. The appraisal
+        moves to the sent stage once the mail queue delivers its emails"""
+        reviewers_list = []
+        for appraisal in self:
+            for appraisal_reviewers, survey_id in appraisal.fetch_appraisal_reviewer():
+                for reviewers in appraisal_reviewers:
+                    response = survey_id._create_answer(survey_id=survey_id.id,
+                                                        deadline=appraisal.appraisal_deadline,
+                                                        partner=reviewers.user_id.partner_id,
+                                                        email=reviewers.work_email,
+                                                        appraisal_id=appraisal.id)
+                    reviewers_list.append((appraisal, survey_id, reviewers, response))
+        if not reviewers_list:
+            return
+        baseurl = self.env['ir.config_parameter'].sudo().get_param(
+            'web.base.url')
+        self.env['mail.mail'].sudo().create([
+            appraisal._prepare_survey_mail_vals(survey_id, reviewers, baseurl + str(response.get_start_url()))
+            for appraisal, survey_id, reviewers, response in reviewers_list
+        ])
+        self.write({'tot_sent_survey': 0, 'check_sent': True})
+
+    def _prepare_survey_mail_vals(self, survey_id, reviewers, url):
+        """Return the values of the queued email inviting the reviewer to
+        fill the survey at url"""
+        self.ensure_one()
+        mail_content = "Dear " + reviewers.name + "," + "<br>Please fill out the following survey " \
+                                                        "related to " + self.employee_id.name + "<br>Click here to access the survey.<br>" + \
+                       url + "<br>Post your response for the appraisal till : " \
+                       + str(self.appraisal_deadline)
+        return {'model': 'hr.appraisal', 'res_id': self.id,
+                'subject': survey_id.title,
+                'body_html': mail_content, 'parent_id': None,
+                'email_from': self.env.user.email or None,
+                'auto_delete': True, 'email_to': reviewers.work_email,
+                'is_appraisal_survey': True}
+
+    @api.model
+    def _register_sent_surveys(self, appraisal_ids):
+        """Count the survey emails delivered for the given appraisal ids. The
+        counts are written once per appraisal when the transaction commits,
+        however many emails the queue sent in it"""
+        sent_counts = self.env.cr.precommit.data.setdefault(
+            'oh_appraisal.sent_surveys', Counter())
+        if not sent_counts:
+            self.env.cr.precommit.add(self._flush_sent_surveys)
+        sent_counts.update(appraisal_ids)
+
+    def _flush_sent_surveys(self):
+        """Update the sent counts and the stage of the appraisals whose
+        survey emails were delivered in the transaction"""
+        sent_counts = self.env.cr.precommit.data.pop(
+            'oh_appraisal.sent_surveys', Counter())
+        appraisals = self.sudo().browse(sent_counts).exists()
+        if not appraisals:
+            return
+        stage = appraisals.env['hr.appraisal.stages'].search([('sequence', '=', 1)])
+        for appraisal in appraisals:
+            vals = {'tot_sent_survey': appraisal.tot_sent_survey + sent_counts[appraisal.id]}
+            if appraisal.check_draft:
+                vals.update({'stage_id': stage.id, 'check_draft': False})
+            appraisal.write(vals)
+        appraisals.flush_recordset()
 
     def action_get_answers(self):
         """ This function will return all the answers posted related to
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+###############################################################################
+#    A part of Open HRMS Project <https://www.openhrms.com>
+#
+#    Cybrosys Technologies Pvt. Ltd.
+#    Copyright (C) 2024-TODAY Cybrosys Technologies (<https://www.cybrosys.com>)
+#
+#    This program is free software: you can modify
+#    it under the terms of the GNU Affero General Public License (AGPL) as
+#    published by the Free Software Foundation, either version 3 of the
+#    License, or (at your option) any later version.
+#
+#    This program is distributed in the hope that it will be useful,
+#    but WITHOUT ANY WARRANTY; without even the implied warranty of
+#    MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#    GNU Affero General Public License for more details.
+#
+#    You should have received a copy of the GNU Affero General Public License
+#    along with this program.  If not, see <https://www.gnu.org/licenses/>.
+#
+###############################################################################
+from odoo import fields, models
+
+
+class MailMail(models.Model):
+    """Inherits the model mail.mail to report the delivered appraisal
+    survey emails to their appraisal."""
+    _inherit = 'mail.mail'
+
+    is_appraisal_survey = fields.Boolean(string="Appraisal Survey",
+                                         help="Whether the email invites a "
+                                              "reviewer to an appraisal "
+                                              "survey")
+
+    def _postprocess_sent_message(self, success_pids, failure_reason=False,
+                                  failure_type=None):
+        """Count the appraisal survey emails sent successfully before they
+        are deleted by the post-processing"""
+        if not failure_type:
+            sent_mails = self.filtered(
+                lambda mail: mail.is_appraisal_survey and mail.res_id)
+            if sent_mails:
+                self.env['hr.appraisal']._register_sent_surveys(
+                    sent_mails.mapped('res_id'))
+        return super()._postprocess_sent_message(
+            success_pids, failure_reason=failure_reason,
+            failure_type=failure_type)
@@ -31,10 +31,11 @@ class SurveyUserInput(models.Model):
                                    help="Appraisal ID of the user input for "
                                         "the survey")
 
-    @api.model
-    def create(self, vals):
+    @api.model_create_multi
+    def create(self, vals_list):
         """inherits the create method of the model survey.user_input"""
         ctx = self.env.context
         if ctx.get('active_id') and ctx.get('active_model') == 'hr.appraisal':
-            vals['appraisal_id'] = ctx.get('active_id')
-        return super(SurveyUserInput, self).create(vals)
+            for vals in vals_list:
+                vals.setdefault('appraisal_id', ctx.get('active_id'))
+        return super(SurveyUserInput, self).create(vals_list)
@@ -23,6 +23,7 @@
 from datetime import date, timedelta
 from odoo import api, fields, models, _
 from odoo.exceptions import UserError
+from odoo.tools import html_escape
 
 
 class HrEmployeeDocument(models.Model):
@@ -62,51 +63,64 @@ class HrEmployeeDocument(models.Model):
     ], string='Notification Type',
         help="Select type of the documents expiry notification.")
 
-    def mail_reminder(self):
-        """Sending document expiry notification to employees."""
-        for record in self.search([('expiry_date', '!=', False)]):
-            exp_date = fields.Date.from_string(record.expiry_date)
+    notification_date = fields.Date(
+        string='Notification Start', compute='_compute_notification_dates',
+        store=True, index=True,
+        help="First day an expiry notification is sent for the document.")
+    notification_end_date = fields.Date(
+        string='Notification End', compute='_compute_notification_dates',
+        store=True, index=True,
+        help="Last day an expiry notification is sent for the document.")
+
+    @api.depends('expiry_date', 'before_days', 'notification_type')
+    def _compute_notification_dates(self):
+        """Compute the window of days the expiry notification is sent, from
+        the expiry date and the notification type."""
+        for record in self:
+            if not record.expiry_date:
+                record.notification_date = record.notification_end_date = False
+                continue
             days_before = timedelta(days=record.before_days or 0)
-            is_expiry_today = fields.Date.today() == exp_date
-            is_notification_day = any([record.notification_type == 'single'
-                                       and is_expiry_today,
-                                       record.notification_type == 'multi'
-                                       and (fields.Date.today() == fields.Date.
-                                            from_string(
-                                           record.expiry_date) - days_before
-                                            or is_expiry_today),
-                                       record.notification_type == 'everyday'
-                                       and fields.Date.today() >= fields.Date.
-                                      from_string(
-                                           record.expiry_date) - days_before,
-                                       record.notification_type ==
-                                       'everyday_after'
-                                       and fields.Date.today() <=
-                                       fields.Date.from_string(
-                                           record.expiry_date) + days_before,
-                                       not record.notification_type and
-                                       fields.Date.today() == fields.Date.
-                                      from_string(
-                                           record.expiry_date) - timedelta(
-                                           days=7), ])
-            if is_notification_day:
-                employee_name = record.employee_ref_id.name
-                document_name = record.name
-                expiry_date_str = str(record.expiry_date)
-                mail_content = (
-                    f"Hello {employee_name},<br>Your Document {document_name} "
-                    f"is going to expire on {expiry_date_str}. "
-                    "Please renew it before the expiry date."
-                )
-                subject = _('Document-%s Expired On %s') % (
-                    document_name, expiry_date_str)
-                main_content = {
-                    'subject': subject,
-                    'author_id': self.env.user.partner_id.id,
-                    'body_html': mail_content,
-                    'email_to': record.employee_ref_id.work_email,
-                }
-                self.env['mail.mail'].create(main_content).send()
+            start = end = record.expiry_date
+            if record.notification_type in ('multi', 'everyday'):
+                start = record.expiry_date - days_before
+            elif record.notification_type == 'everyday_after':
+                end = record.expiry_date + days_before
+            elif not record.notification_type:
+                start = end = record.expiry_date - timedelta(days=7)
+            record.notification_date = start
+            record.notification_end_date = end
+
+    @api.model
+    def mail_reminder(self):
+        """Queue one digest mail per employee listing the documents to be
+        notified today."""
+        today = fields.Date.today()
+        documents = self.search([('notification_date', '<=', today),
+                                 ('notification_end_date', '>=', today),
+                                 ('employee_ref_id.work_email', '!=', False)])
+        # notifications before few days are only sent on both ends of the
+        # window
+        documents = documents.filtered(
+            lambda document: document.notification_type != 'multi' or today in (
+                document.notification_date, document.notification_end_date))
+        mail_values = []
+        for employee, employee_documents in documents.grouped(
+                'employee_ref_id').items():
+            document_lines = ''.join(
+                f"<li>{html_escape(document.name)}: {document.expiry_date}</li>"
+                for document in employee_documents)
+            mail_values.append({
+                'subject': _('Documents Expiring Soon'),
+                'author_id': self.env.user.partner_id.id,
+                'body_html': (
+                    f"Hello {html_escape(employee.name)},<br>The following "
+                    "documents are going to expire. Please renew them before "
+                    f"the expiry date.<ul>{document_lines}</ul>"),
+                'email_to': employee.work_email,
+            })
+        # sent by the mail queue
+        self.env['mail.mail'].sudo().create(mail_values)
 
     @api.constrains('expiry_date')
     def _check_expiry_date(self):
@@ -20,7 +20,7 @@
 #    If not, see <http://www.gnu.org/licenses/>.
 #
 #############################################################################
-from odoo import models
+from odoo import api, models
 
 
 class HrPayslip(models.Model):
@@ -28,6 +28,31 @@ class HrPayslip(models.Model):
     additional functionality related to employee loans."""
     _inherit = 'hr.payslip'
 
+    def _get_loan_lines(self, employee_ids, date_from, date_to):
+        """Return the unpaid lines of approved loans due between date_from
+        and date_to, grouped by employee id.
+        :param employee_ids: IDs of the employees.
+        :param date_from: Start date of the payslip.
+        :param date_to: End date of the payslip.
+        :return: Dictionary mapping each employee ID to the IDs of its
+        loan lines."""
+        loan_lines = {employee_id: [] for employee_id in employee_ids}
+        for line in self.env['hr.loan.line'].search(
+                [('date', '>=', date_from), ('date', '<=', date_to),
+                 ('paid', '=', False),
+                 ('loan_id.employee_id', 'in', list(employee_ids)),
+                 ('loan_id.state', '=', 'approve')]):
+            loan_lines[line.loan_id.employee_id.id].append(line.id)
+        return loan_lines
+
+    @api.model
+    def _get_inputs_prefetch(self, employees, date_from, date_to):
+        """Load the due loan lines of the whole batch in one search."""
+        res = super()._get_inputs_prefetch(employees, date_from, date_to)
+        res['payslip_loan_lines'] = self._get_loan_lines(
+            employees.ids, date_from, date_to)
+        return res
+
     def get_inputs(self, contract_ids, date_from, date_to):
         """Compute additional inputs for the employee payslip,
         considering active loans.
@@ -41,16 +66,17 @@ class HrPayslip(models.Model):
         employee_id = self.env['hr.contract'].sudo().browse(
             contract_ids[0].id).employee_id if contract_ids \
             else self.employee_id
-        loan_lines = self.env['hr.loan.line'].search(
-            [('date', '>=', date_from), ('date', '<=', date_to), ('paid', '=', False),
-             ('loan_id.employee_id', '=', employee_id.id),
-             ('loan_id.state', '=', 'approve')]
-        )
+        loan_lines = self.env.context.get('payslip_loan_lines')
+        if loan_lines is None or employee_id.id not in loan_lines:
+            loan_lines = self._get_loan_lines(
+                employee_id.ids, date_from, date_to)
+        loan_lines = self.env['hr.loan.line'].browse(
+            loan_lines.get(employee_id.id, []))
         total_loan_amount = sum(loan_lines.mapped('amount'))
         for input in res:
             if input.get('code') == 'LO':
                 input.update({'amount': total_loan_amount,
-                              'loan_line_ids': [(4, line.id) for line in loan_lines]})        
+                              'loan_line_ids': [(4, line.id) for line in loan_lines]})
         return res
 
     def action_payslip_done(self):
@@ -3,20 +3,15 @@ from odoo import models
 class HrPayslipLine(models.Model):
     _inherit = 'hr.payslip.line'
 
-    def _compute_related_records_count(self):
-        for line in self:
-            if line.salary_rule_id.code != 'ADVANCE':
-                super(HrPayslipLine, line)._compute_related_records_count()
-            else:
-                date_from = line.slip_id.date_from
-                date_to = line.slip_id.date_to
-                employee_id = line.slip_id.employee_id
-                loan_lines_count = self.env['hr.loan.line'].search_count(
-                    [('date', '>=', date_from), ('date', '<=', date_to),
-                     ('loan_id.employee_id', '=', employee_id.id),
-                     ('loan_id.state', '=', 'approve')]
-                )
-                line.update({'related_records_count': loan_lines_count})
+    def _get_related_records_counters(self):
+        counters = super()._get_related_records_counters()
+        counters['ADVANCE'] = '_count_advance_records'
+        return counters
+
+    def _count_advance_records(self):
+        return self._count_related_records(
+            'hr.loan.line', [('loan_id.state', '=', 'approve')],
+            'loan_id.employee_id', 'date')
 
     def open_related_records(self):
         self.ensure_one()
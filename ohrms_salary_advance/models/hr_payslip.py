@@ -20,7 +20,9 @@
 #    If not, see <http://www.gnu.org/licenses/>.
 #
 #############################################################################
-from odoo import models
+from dateutil.relativedelta import relativedelta
+
+from odoo import api, models
 
 
 class HrPayslip(models.Model):
@@ -28,6 +30,27 @@ class HrPayslip(models.Model):
         inorder to add details of advance salary in the payslip."""
     _inherit = 'hr.payslip'
 
+    def _get_salary_advances(self, employee_ids, date_from):
+        """Return the approved advance amount of each employee for the
+        month of date_from, the latest advance of the month prevailing."""
+        month_start = date_from.replace(day=1)
+        advances = {employee_id: 0 for employee_id in employee_ids}
+        for record in self.env['salary.advance'].search(
+                [('employee_id', 'in', list(employee_ids)),
+                 ('state', '=', 'approve'), ('advance', '!=', 0),
+                 ('date', '>=', month_start),
+                 ('date', '<', month_start + relativedelta(months=1))]):
+            advances[record.employee_id.id] = record.advance
+        return advances
+
+    @api.model
+    def _get_inputs_prefetch(self, employees, date_from, date_to):
+        """Load the approved advances of the whole batch in one search."""
+        res = super()._get_inputs_prefetch(employees, date_from, date_to)
+        res['payslip_salary_advances'] = self._get_salary_advances(
+            employees.ids, date_from)
+        return res
+
     def get_inputs(self, contract_ids, date_from, date_to):
         """Supering get_inputs() method inorder to add details of advance
            salary in the payslip."""
@@ -36,17 +59,12 @@ class HrPayslip(models.Model):
         employee_id = self.env['hr.contract'].browse(
             contract_ids[0].id).employee_id if contract_ids \
             else self.employee_id
-        advance_salary = self.env['salary.advance'].search(
-            [('employee_id', '=', employee_id.id)])
-        for record in advance_salary:
-            current_date = date_from.month
-            date = record.date
-            existing_date = date.month
-            if current_date == existing_date:
-                state = record.state
-                amount = record.advance
-                for result in res:
-                    if state == 'approve' and amount != 0 and result.get(
-                            'code') == 'SAR':
-                        result['amount'] = amount
+        advances = self.env.context.get('payslip_salary_advances')
+        if advances is None or employee_id.id not in advances:
+            advances = self._get_salary_advances(employee_id.ids, date_from)
+        amount = advances.get(employee_id.id)
+        if amount:
+            for result in res:
+                if result.get('code') == 'SAR':
+                    result['amount'] = amount
         return res
@@ -1,2 +1,3 @@
 from . import account_budget
 from . import account_analytic_account
+from . import res_config_settings
@@ -1,5 +1,8 @@
+from collections import defaultdict
+
 from odoo import api, fields, models, _
 from odoo.exceptions import ValidationError
+from odoo.tools import SQL, split_every, str2bool
 
 
 class AccountBudgetPost(models.Model):
@@ -92,6 +95,9 @@ class CrossoveredBudgetLines(models.Model):
         help="Amount you plan to earn/spend. Record a positive amount if it is a revenue and a negative amount if it is a cost.")
     practical_amount = fields.Monetary(
         compute='_compute_practical_amount', string='Practical Amount', help="Amount really earned/spent.")
+    practical_amount_cache = fields.Monetary(
+        'Cached Practical Amount', readonly=True, copy=False,
+        help="Practical amount as computed by the last run of the refresh scheduled action.")
     theoritical_amount = fields.Monetary(
         compute='_compute_theoritical_amount', string='Theoretical Amount',
         help="Amount you are supposed to have earned/spent at this date.")
@@ -111,7 +117,16 @@ class CrossoveredBudgetLines(models.Model):
         result = super(CrossoveredBudgetLines, self).read_group(domain, fields, groupby, offset=offset, limit=limit,
                                                                 orderby=orderby, lazy=lazy)
         if any(x in fields for x in fields_list):
-            for group_line in result:
+            need_practical = 'practical_amount' in fields or 'percentage' in fields
+            need_theoritical = 'theoritical_amount' in fields or 'percentage' in fields
+
+            # resolve the lines of every group first, so that practical amounts
+            # are fetched once for all of them instead of once per line
+            group_budget_lines = [self.search(group_line.get('__domain') or []) for group_line in result]
+            all_budget_lines = self.browse().union(*group_budget_lines)
+            practical_amounts = all_budget_lines._get_practical_amounts() if need_practical else {}
+
+            for group_line, budget_lines_of_group in zip(result, group_budget_lines):
 
                 # initialise fields to compute to 0 if they are requested
                 if 'practical_amount' in fields:
@@ -123,22 +138,17 @@ class CrossoveredBudgetLines(models.Model):
                     group_line['practical_amount'] = 0
                     group_line['theoritical_amount'] = 0
 
-                if group_line.get('__domain'):
-                    all_budget_lines_that_compose_group = self.search(group_line['__domain'])
-                else:
-                    all_budget_lines_that_compose_group = self.search([])
-                for budget_line_of_group in all_budget_lines_that_compose_group:
-                    if 'practical_amount' in fields or 'percentage' in fields:
-                        group_line['practical_amount'] += budget_line_of_group.practical_amount
-
-                    if 'theoritical_amount' in fields or 'percentage' in fields:
-                        group_line['theoritical_amount'] += budget_line_of_group.theoritical_amount
+                if need_practical:
+                    group_line['practical_amount'] = sum(
+                        practical_amounts.get(line_id, 0.0) for line_id in budget_lines_of_group.ids)
+                if need_theoritical:
+                    group_line['theoritical_amount'] = sum(budget_lines_of_group.mapped('theoritical_amount'))
 
-                    if 'percentage' in fields:
-                        if group_line['theoritical_amount']:
-                            # use a weighted average
-                            group_line['percentage'] = float(
-                                (group_line['practical_amount'] or 0.0) / group_line['theoritical_amount']) * 100
+                if 'percentage' in fields:
+                    if group_line['theoritical_amount']:
+                        # use a weighted average
+                        group_line['percentage'] = float(
+                            (group_line['practical_amount'] or 0.0) / group_line['theoritical_amount']) * 100
 
         return result
 
@@ -160,44 +170,134 @@ class CrossoveredBudgetLines(models.Model):
             line.name = computed_name
 
     def _compute_practical_amount(self):
+        practical_amounts = self._get_practical_amounts()
         for line in self:
-            acc_ids = line.general_budget_id.account_ids.ids
-            date_to = line.date_to
-            date_from = line.date_from
-            if line.analytic_account_id.id:
-                analytic_line_obj = self.env['account.analytic.line']
-                domain = [('account_id', '=', line.analytic_account_id.id),
-                          ('date', '>=', date_from),
-                          ('date', '<=', date_to),
-                          ]
-                if acc_ids:
-                    domain += [('general_account_id', 'in', acc_ids)]
-
-                where_query = analytic_line_obj._where_calc(domain)
-                analytic_line_obj._apply_ir_rules(where_query, 'read')
-                from_string, from_params = where_query.from_clause
-                where_string, where_params = where_query.where_clause
-                from_clause, where_clause, where_clause_params = from_string, where_string, from_params + where_params
-
-                select = "SELECT SUM(amount) from " + from_clause + " where " + where_clause
+            line.practical_amount = practical_amounts.get(line.id, 0.0)
 
+    @api.model
+    def _is_practical_amount_cached(self):
+        return str2bool(self.env['ir.config_parameter'].sudo().get_param(
+            'om_account_budget.practical_amount_cached', 'False'))
+
+    def _get_practical_amounts(self):
+        """ Return a dict {budget line id: practical amount} for the whole recordset.
+
+        In cached mode the amounts stored by the scheduled action are returned,
+        otherwise they are computed live with :meth:`_query_practical_amounts`.
+        """
+        if self._is_practical_amount_cached():
+            return {line.id: line.practical_amount_cache for line in self}
+        return self._query_practical_amounts()
+
+    def _query_practical_amounts(self):
+        """ Compute the practical amounts of the recordset with one grouped query
+        over analytic lines and one over journal items.
+
+        Budget lines sharing the same analytic account, accounts and date range
+        are computed only once.
+        """
+        # {(analytic account id, account ids, date from, date to): budget lines}
+        analytic_keys = defaultdict(list)
+        general_keys = defaultdict(list)
+        for line in self:
+            acc_ids = tuple(sorted(line.general_budget_id.account_ids.ids))
+            if line.analytic_account_id.id:
+                key = (line.analytic_account_id.id, acc_ids, line.date_from, line.date_to)
+                analytic_keys[key].append(line)
             else:
-                aml_obj = self.env['account.move.line']
-                domain = [('account_id', 'in',
-                           line.general_budget_id.account_ids.ids),
-                          ('date', '>=', date_from),
-                          ('date', '<=', date_to)
-                          ]
-                where_query = aml_obj._where_calc(domain)
-                aml_obj._apply_ir_rules(where_query, 'read')
-                from_string, from_params = where_query.from_clause
-                where_string, where_params = where_query.where_clause
-                from_clause, where_clause, where_clause_params = from_string, where_string, from_params + where_params
-
-                select = "SELECT sum(credit)-sum(debit) from " + from_clause + " where " + where_clause
-
-            self.env.cr.execute(select, where_clause_params)
-            line.practical_amount = self.env.cr.fetchone()[0] or 0.0
+                key = (False, acc_ids, line.date_from, line.date_to)
+                general_keys[key].append(line)
+
+        result = {line.id: 0.0 for line in self}
+        for keys, amounts in (
+            (analytic_keys, self._query_analytic_amounts(list(analytic_keys))),
+            (general_keys, self._query_move_line_amounts(list(general_keys))),
+        ):
+            for index, key in enumerate(keys):
+                for line in keys[key]:
+                    result[line.id] = amounts.get(index) or 0.0
+        return result
+
+    def _practical_amount_keys_table(self, keys):
+        """ Return the keys as a VALUES table ``budget_key(idx, analytic_account_id,
+        account_ids, date_from, date_to)``, ``idx`` being the position in ``keys``.
+        """
+        return SQL("(VALUES %s) AS budget_key(idx, analytic_account_id, account_ids, date_from, date_to)", SQL(", ").join(
+            SQL("(%s, %s::int, %s::int[], %s::date, %s::date)",
+                index, analytic_account_id or None, list(acc_ids), date_from, date_to)
+            for index, (analytic_account_id, acc_ids, date_from, date_to) in enumerate(keys)
+        ))
+
+    @api.model
+    def _query_analytic_amounts(self, keys):
+        if not keys:
+            return {}
+        analytic_line_obj = self.env['account.analytic.line']
+        domain = [('account_id', 'in', list({key[0] for key in keys})),
+                  ('date', '>=', min(key[2] for key in keys)),
+                  ('date', '<=', max(key[3] for key in keys)),
+                  ]
+        where_query = analytic_line_obj._where_calc(domain)
+        analytic_line_obj._apply_ir_rules(where_query, 'read')
+        table = SQL.identifier(analytic_line_obj._table)
+        self.env.cr.execute(SQL(
+            """SELECT budget_key.idx, SUM(%(table)s.amount)
+                 FROM %(from_clause)s
+                 JOIN %(keys)s
+                   ON %(table)s.account_id = budget_key.analytic_account_id
+                  AND %(table)s.date BETWEEN budget_key.date_from AND budget_key.date_to
+                  AND (cardinality(budget_key.account_ids) = 0
+                       OR %(table)s.general_account_id = ANY(budget_key.account_ids))
+                WHERE %(where_clause)s
+             GROUP BY budget_key.idx""",
+            table=table,
+            from_clause=where_query.from_clause,
+            keys=self._practical_amount_keys_table(keys),
+            where_clause=where_query.where_clause or SQL("TRUE"),
+        ))
+        return dict(self.env.cr.fetchall())
+
+    @api.model
+    def _query_move_line_amounts(self, keys):
+        if not keys:
+            return {}
+        aml_obj = self.env['account.move.line']
+        domain = [('account_id', 'in', list({acc_id for key in keys for acc_id in key[1]})),
+                  ('date', '>=', min(key[2] for key in keys)),
+                  ('date', '<=', max(key[3] for key in keys)),
+                  ]
+        where_query = aml_obj._where_calc(domain)
+        aml_obj._apply_ir_rules(where_query, 'read')
+        table = SQL.identifier(aml_obj._table)
+        self.env.cr.execute(SQL(
+            """SELECT budget_key.idx, SUM(%(table)s.credit) - SUM(%(table)s.debit)
+                 FROM %(from_clause)s
+                 JOIN %(keys)s
+                   ON %(table)s.account_id = ANY(budget_key.account_ids)
+                  AND %(table)s.date BETWEEN budget_key.date_from AND budget_key.date_to
+                WHERE %(where_clause)s
+             GROUP BY budget_key.idx""",
+            table=table,
+            from_clause=where_query.from_clause,
+            keys=self._practical_amount_keys_table(keys),
+            where_clause=where_query.where_clause or SQL("TRUE"),
+        ))
+        return dict(self.env.cr.fetchall())
+
+    @api.model
+    def _cron_refresh_practical_amount_cache(self, batch_size=1000):
+        """ Refresh the stored practical amounts used in cached mode. """
+        if not self._is_practical_amount_cached():
+            return
+        lines = self.search([('crossovered_budget_state', '!=', 'cancel')])
+        for batch_ids in split_every(batch_size, lines.ids):
+            batch = self.browse(batch_ids)
+            lines_by_amount = defaultdict(list)
+            for line_id, amount in batch._query_practical_amounts().items():
+                lines_by_amount[amount].append(line_id)
+            for amount, line_ids in lines_by_amount.items():
+                self.browse(line_ids).write({'practical_amount_cache': amount})
+            batch.invalidate_recordset(['practical_amount'])
 
     def _compute_theoritical_amount(self):
         # beware: 'today' variable is mocked in the python tests and thus, its implementation matter
@@ -0,0 +1,11 @@
+from odoo import fields, models
+
+
+class ResConfigSettings(models.TransientModel):
+    _inherit = 'res.config.settings'
+
+    budget_practical_amount_cached = fields.Boolean(
+        string="Cached Practical Amounts",
+        config_parameter='om_account_budget.practical_amount_cached',
+        help="Read budget practical amounts from a stored value refreshed by a scheduled action "
+             "instead of computing them on the fly.")
@@ -1,3 +1,4 @@
 from . import account_fiscal_year
 from . import account_settings
+from . import account_move
 from . import res_company
@@ -0,0 +1,14 @@
+from odoo import models
+from odoo.tools.sql import create_index
+
+
+class AccountMove(models.Model):
+    _inherit = 'account.move'
+
+    def init(self):
+        super().init()
+        # Draft moves are few compared to posted ones, the fiscal year lock
+        # check only needs to know whether one exists before the lock date
+        create_index(
+            self.env.cr, 'account_move_fiscalyear_lock_draft_idx', self._table,
+            ['company_id', 'date'], where="state = 'draft'")
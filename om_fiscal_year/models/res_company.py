@@ -1,5 +1,6 @@
 from odoo import api, fields, models, _
 from odoo.exceptions import RedirectWarning, ValidationError
+from odoo.tools import SQL
 
 
 class ResCompany(models.Model):
@@ -7,11 +8,9 @@ class ResCompany(models.Model):
 
     def _validate_fiscalyear_lock(self, values):
         if values.get('fiscalyear_lock_date'):
-            draft_entries = self.env['account.move'].search([
-                ('company_id', 'in', self.ids),
-                ('state', '=', 'draft'),
-                ('date', '<=', values['fiscalyear_lock_date'])])
-            if draft_entries:
+            lock_date = fields.Date.to_date(values['fiscalyear_lock_date'])
+            draft_entries_domain = self._get_fiscalyear_lock_draft_domain(lock_date)
+            if self._fiscalyear_lock_records_exist('account.move', draft_entries_domain):
                 error_msg = _(
                     'There are still unposted entries in the period you want to lock. You should either post or delete them.')
                 action_error = {
@@ -19,20 +18,43 @@ class ResCompany(models.Model):
                     'name': 'Unposted Entries',
                     'res_model': 'account.move',
                     'type': 'ir.actions.act_window',
-                    'domain': [('id', 'in', draft_entries.ids)],
+                    'domain': draft_entries_domain,
                     'search_view_id': [self.env.ref('account.view_account_move_filter').id, 'search'],
                     'views': [[self.env.ref('account.view_move_tree').id, 'list'],
                               [self.env.ref('account.view_move_form').id, 'form']],
                 }
                 raise RedirectWarning(error_msg, action_error, _('Show unposted entries'))
 
-            unreconciled_statement_lines = self.env['account.bank.statement.line'].search([
-                ('company_id', 'in', self.ids),
-                ('is_reconciled', '=', False),
-                ('date', '<=', values['fiscalyear_lock_date']),
-                ('move_id.state', 'in', ('draft', 'posted')),
-            ])
-            if unreconciled_statement_lines:
+            unreconciled_statement_lines_domain = self._get_fiscalyear_lock_statement_line_domain(lock_date)
+            if self._fiscalyear_lock_records_exist('account.bank.statement.line', unreconciled_statement_lines_domain):
                 error_msg = _("There are still unreconciled bank statement lines in the period you want to lock."
                               "You should either reconcile or delete them.")
                 raise ValidationError(error_msg)
+
+    def _get_fiscalyear_lock_draft_domain(self, lock_date):
+        """ Domain of the draft entries preventing to lock the period up to
+        lock_date, served by the account_move_fiscalyear_lock_draft_idx
+        partial index """
+        return [
+            ('company_id', 'in', self.ids),
+            ('state', '=', 'draft'),
+            ('date', '<=', fields.Date.to_string(lock_date)),
+        ]
+
+    def _get_fiscalyear_lock_statement_line_domain(self, lock_date):
+        """ Domain of the unreconciled statement lines preventing to lock the
+        period up to lock_date """
+        return [
+            ('company_id', 'in', self.ids),
+            ('is_reconciled', '=', False),
+            ('date', '<=', fields.Date.to_string(lock_date)),
+            ('move_id.state', 'in', ('draft', 'posted')),
+        ]
+
+    @api.model
+    def _fiscalyear_lock_records_exist(self, model_name, domain):
+        """ Return whether any record of model_name matches domain, without
+        reading the matching ids """
+        query = self.env[model_name]._search(domain)
+        self.env.cr.execute(SQL("SELECT EXISTS(%s)", query.select()))
+        return self.env.cr.fetchone()[0]
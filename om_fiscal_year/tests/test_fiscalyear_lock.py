@@ -0,0 +1,44 @@
+from odoo import fields
+from odoo.addons.account.tests.common import AccountTestInvoicingCommon
+from odoo.exceptions import RedirectWarning, ValidationError
+from odoo.tests import tagged
+
+
+@tagged('post_install', '-at_install')
+class TestFiscalYearLock(AccountTestInvoicingCommon):
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.company = cls.company_data['company']
+        cls.lock_date = fields.Date.from_string('2010-12-31')
+        cls.lock_values = {'fiscalyear_lock_date': cls.lock_date}
+
+    def _create_statement_line(self, date):
+        return self.env['account.bank.statement.line'].create({
+            'journal_id': self.company_data['default_journal_bank'].id,
+            'date': date,
+            'payment_ref': 'Fiscal year lock',
+            'amount': 100.0,
+        })
+
+    def test_lock_without_blockers(self):
+        self.company._validate_fiscalyear_lock(self.lock_values)
+
+    def test_lock_with_draft_entries(self):
+        invoice = self.init_invoice('out_invoice', invoice_date='2010-06-01', amounts=[100.0])
+        with self.assertRaises(RedirectWarning) as error:
+            self.company._validate_fiscalyear_lock(self.lock_values)
+        action = error.exception.args[1]
+        self.assertEqual(self.env['account.move'].search(action['domain']), invoice)
+
+    def test_lock_with_unreconciled_statement_lines(self):
+        statement_line = self._create_statement_line('2010-06-01')
+        self.assertFalse(statement_line.is_reconciled)
+        with self.assertRaises(ValidationError):
+            self.company._validate_fiscalyear_lock(self.lock_values)
+
+    def test_lock_ignores_entries_after_lock_date(self):
+        self.init_invoice('out_invoice', invoice_date='2011-01-01', amounts=[100.0])
+        self._create_statement_line('2011-01-01')
+        self.company._validate_fiscalyear_lock(self.lock_values)
@@ -1,7 +1,15 @@
+import logging
+import threading
 from datetime import date
 from dateutil.relativedelta import relativedelta
 from odoo import models, fields, api, _
-from odoo.exceptions import ValidationError
+from odoo.exceptions import UserError, ValidationError
+from odoo.tools import split_every
+
+_logger = logging.getLogger(__name__)
+
+# Number of recurring payment lines posted per committed chunk
+PAYMENT_POST_BATCH_SIZE = 100
 
 
 class RecurringPayment(models.Model):
@@ -77,11 +85,29 @@ class RecurringPayment(models.Model):
                 line.unlink()
             self.state = 'draft'
 
-    def action_generate_payment(self):
-        line_ids = self.env['recurring.payment.line'].search([('date', '<=', date.today()),
-                                                                       ('state', '!=', 'done')])
-        for line in line_ids:
-            line.action_create_payment()
+    @api.model
+    def action_generate_payment(self, batch_size=PAYMENT_POST_BATCH_SIZE):
+        """ Create the payments of all due lines with a single batched create,
+        then post them by chunks of batch_size, committing after each step.
+        Lines of a chunk failing to post keep their draft payment and are
+        posted again by the next run. """
+        auto_commit = not getattr(threading.current_thread(), 'testing', False)
+        lines = self.env['recurring.payment.line'].search([('date', '<=', date.today()),
+                                                           ('state', '!=', 'done')], order='date, id')
+        lines._create_payments()
+        if auto_commit:
+            self.env.cr.commit()
+        to_post = lines.filtered(lambda line: line.state != 'done')
+        for batch_ids in split_every(batch_size, to_post.ids):
+            batch = self.env['recurring.payment.line'].browse(batch_ids)
+            try:
+                with self.env.cr.savepoint():
+                    batch._post_payments()
+            except (UserError, ValidationError) as e:
+                _logger.warning("Recurring payment lines %s could not be posted: %s", batch.ids, e)
+                continue
+            if auto_commit:
+                self.env.cr.commit()
 
     @api.model_create_multi
     def create(self, vals_list):
@@ -120,8 +146,9 @@ class RecurringPaymentLine(models.Model):
     state = fields.Selection(selection=[('draft', 'Draft'),
                                         ('done', 'Done')], default='draft', string='Status')
 
-    def action_create_payment(self):
-        vals = {
+    def _prepare_payment_vals(self):
+        self.ensure_one()
+        return {
             'payment_type': self.recurring_payment_id.payment_type,
             'amount': self.amount,
             'currency_id': self.currency_id.id,
@@ -131,9 +158,23 @@ class RecurringPaymentLine(models.Model):
             'memo': self.recurring_payment_id.name,
             'partner_id': self.partner_id.id,
         }
-        payment = self.env['account.payment'].create(vals)
-        if payment:
-            if self.recurring_payment_id.journal_state == 'posted':
-                payment.action_post()
-            self.write({'state': 'done', 'payment_id': payment.id})
 
+    def _create_payments(self):
+        """ Create the payments of the lines not having one yet with a single
+        batched create. Lines generating unposted payments are done at once,
+        the others once their payment is posted. """
+        lines = self.filtered(lambda line: not line.payment_id)
+        payments = self.env['account.payment'].create([line._prepare_payment_vals() for line in lines])
+        for line, payment in zip(lines, payments):
+            line.payment_id = payment
+        lines.filtered(lambda line: line.recurring_payment_id.journal_state != 'posted').write({'state': 'done'})
+        return payments
+
+    def _post_payments(self):
+        lines = self.filtered(lambda line: line.payment_id and line.state != 'done')
+        lines.payment_id.filtered(lambda payment: payment.state == 'draft').action_post()
+        lines.write({'state': 'done'})
+
+    def action_create_payment(self):
+        self._create_payments()
+        self._post_payments()
@@ -1,11 +1,18 @@
 # Part of Odoo. See LICENSE file for full copyright and licensing details.
 
+from collections import namedtuple
 from datetime import datetime
 
 from dateutil.relativedelta import relativedelta
 
 from odoo import _, api, fields, models
 from odoo.exceptions import UserError
+from odoo.tools import SQL
+
+ContributionRegisterLine = namedtuple(
+    "ContributionRegisterLine",
+    ["slip_name", "code", "name", "quantity", "amount", "total"],
+)
 
 
 class ContributionRegisterReport(models.AbstractModel):
@@ -13,22 +20,36 @@ class ContributionRegisterReport(models.AbstractModel):
     _description = "Payroll Contribution Register Report"
 
     def _get_payslip_lines(self, register_ids, date_from, date_to):
-        result = {}
-        self.env.cr.execute(
+        """Return ({register id: [ContributionRegisterLine]}, {register id: total})
+        for the done payslip lines of the registers in the period, fetched
+        and totalled in a single query."""
+        lines_data = {}
+        lines_total = {}
+        if not register_ids:
+            return lines_data, lines_total
+        PayslipLine = self.env["hr.payslip.line"]
+        query = SQL(
             """
-            SELECT pl.id from hr_payslip_line as pl
+            SELECT pl.register_id, hp.name, pl.code, %(line_name)s,
+                   pl.quantity, pl.amount, pl.total,
+                   SUM(pl.total) OVER (PARTITION BY pl.register_id)
+            FROM hr_payslip_line as pl
             LEFT JOIN hr_payslip AS hp on (pl.slip_id = hp.id)
-            WHERE (hp.date_from >= %s) AND (hp.date_to <= %s)
-            AND pl.register_id in %s
+            WHERE (hp.date_from >= %(date_from)s) AND (hp.date_to <= %(date_to)s)
+            AND pl.register_id in %(register_ids)s
             AND hp.state = 'done'
             ORDER BY pl.slip_id, pl.sequence""",
-            (date_from, date_to, tuple(register_ids)),
+            line_name=PayslipLine._field_to_sql("pl", "name"),
+            date_from=date_from,
+            date_to=date_to,
+            register_ids=tuple(register_ids),
         )
-        line_ids = [x[0] for x in self.env.cr.fetchall()]
-        for line in self.env["hr.payslip.line"].browse(line_ids):
-            result.setdefault(line.register_id.id, self.env["hr.payslip.line"])
-            result[line.register_id.id] += line
-        return result
+        for register_id, *values, register_total in self.env.execute_query(query):
+            lines_data.setdefault(register_id, []).append(
+                ContributionRegisterLine(*values)
+            )
+            lines_total[register_id] = register_total
+        return lines_data, lines_total
 
     @api.model
     def _get_report_values(self, docids, data=None):
@@ -44,11 +65,11 @@ class ContributionRegisterReport(models.AbstractModel):
             "date_to",
             str(datetime.now() + relativedelta(months=+1, day=1, days=-1))[:10],
         )
-        lines_data = self._get_payslip_lines(register_ids, date_from, date_to)
-        lines_total = {}
+        lines_data, lines_total = self._get_payslip_lines(
+            register_ids, date_from, date_to
+        )
         for register in contrib_registers:
-            lines = lines_data.get(register.id)
-            lines_total[register.id] = lines and sum(lines.mapped("total")) or 0.0
+            lines_total.setdefault(register.id, 0.0)
         return {
             "doc_ids": register_ids,
             "doc_model": "hr.contribution.register",
@@ -7,93 +7,125 @@ class PayslipDetailsReport(models.AbstractModel):
     _name = "report.payroll.report_payslipdetails"
     _description = "Payslip Details Report"
 
-    def get_details_by_rule_category(self, payslip_lines):
-        PayslipLine = self.env["hr.payslip.line"]
-        RuleCateg = self.env["hr.salary.rule.category"]
+    def _get_rule_category_tree(self):
+        """Return {category id: category values} for the whole category tree"""
+        return {
+            category["id"]: category
+            for category in self.env["hr.salary.rule.category"].search_read(
+                [], ["name", "code", "parent_id"]
+            )
+        }
 
-        def get_recursive_parent(current_rule_category, rule_categories=None):
-            if rule_categories:
-                rule_categories = current_rule_category | rule_categories
-            else:
-                rule_categories = current_rule_category
+    def _get_category_chain(self, categories, category_id):
+        """Return the category and its parents, the root category first"""
+        chain = []
+        while category_id:
+            category = categories[category_id]
+            chain.insert(0, category)
+            category_id = category["parent_id"] and category["parent_id"][0]
+        return chain
 
-            if current_rule_category.parent_id:
-                return get_recursive_parent(
-                    current_rule_category.parent_id, rule_categories
-                )
-            else:
-                return rule_categories
+    def _read_report_lines(self, payslip_lines, fields_list):
+        """Return {line id: values} for the given payslip lines in one read"""
+        return {line["id"]: line for line in payslip_lines.read(fields_list)}
 
+    def get_details_by_rule_category(self, payslip_lines):
         res = {}
+        if not payslip_lines:
+            return res
+        # lines in report order, along with the total of their category
+        # within their payslip
+        self.env.cr.execute(
+            """
+            SELECT pl.id, pl.category_id, pl.slip_id,
+                   SUM(pl.total) OVER (PARTITION BY pl.slip_id, pl.category_id)
+            FROM hr_payslip_line as pl
+            LEFT JOIN hr_salary_rule_category AS rc on (pl.category_id = rc.id)
+            WHERE pl.id in %s
+            ORDER BY pl.sequence, rc.parent_id, pl.id""",
+            (tuple(payslip_lines.ids),),
+        )
         result = {}
-
-        if payslip_lines:
-            self.env.cr.execute(
-                """
-                SELECT pl.id, pl.category_id, pl.slip_id FROM hr_payslip_line as pl
-                LEFT JOIN hr_salary_rule_category AS rc on (pl.category_id = rc.id)
-                WHERE pl.id in %s
-                GROUP BY rc.parent_id, pl.sequence, pl.id, pl.category_id
-                ORDER BY pl.sequence, rc.parent_id""",
-                (tuple(payslip_lines.ids),),
-            )
-            for x in self.env.cr.fetchall():
-                result.setdefault(x[2], {})
-                result[x[2]].setdefault(x[1], [])
-                result[x[2]][x[1]].append(x[0])
-            for payslip_id, lines_dict in result.items():
-                res.setdefault(payslip_id, [])
-                for rule_categ_id, line_ids in lines_dict.items():
-                    rule_categories = RuleCateg.browse(rule_categ_id)
-                    lines = PayslipLine.browse(line_ids)
-                    level = 0
-                    for parent in get_recursive_parent(rule_categories):
-                        res[payslip_id].append(
-                            {
-                                "rule_category": parent.name,
-                                "name": parent.name,
-                                "code": parent.code,
-                                "level": level,
-                                "total": sum(lines.mapped("total")),
-                            }
-                        )
-                        level += 1
-                    for line in lines:
-                        res[payslip_id].append(
-                            {
-                                "rule_category": line.name,
-                                "name": line.name,
-                                "code": line.code,
-                                "total": line.total,
-                                "level": level,
-                            }
-                        )
+        category_totals = {}
+        for line_id, category_id, slip_id, category_total in self.env.cr.fetchall():
+            result.setdefault(slip_id, {}).setdefault(category_id, []).append(line_id)
+            category_totals[slip_id, category_id] = category_total
+        categories = self._get_rule_category_tree()
+        lines_data = self._read_report_lines(payslip_lines, ["name", "code", "total"])
+        for payslip_id, lines_dict in result.items():
+            res[payslip_id] = []
+            for rule_categ_id, line_ids in lines_dict.items():
+                level = 0
+                for parent in self._get_category_chain(categories, rule_categ_id):
+                    res[payslip_id].append(
+                        {
+                            "rule_category": parent["name"],
+                            "name": parent["name"],
+                            "code": parent["code"],
+                            "level": level,
+                            "total": category_totals[payslip_id, rule_categ_id],
+                        }
+                    )
+                    level += 1
+                for line_id in line_ids:
+                    line = lines_data[line_id]
+                    res[payslip_id].append(
+                        {
+                            "rule_category": line["name"],
+                            "name": line["name"],
+                            "code": line["code"],
+                            "total": line["total"],
+                            "level": level,
+                        }
+                    )
         return res
 
     def get_lines_by_contribution_register(self, payslip_lines):
-        result = {}
         res = {}
-        for line in payslip_lines.filtered("register_id"):
-            result.setdefault(line.slip_id.id, {})
-            result[line.slip_id.id].setdefault(line.register_id, line)
-            result[line.slip_id.id][line.register_id] |= line
+        payslip_lines = payslip_lines.filtered("register_id")
+        if not payslip_lines:
+            return res
+        # lines in payslip order, along with the total of their register
+        # within their payslip
+        self.env.cr.execute(
+            """
+            SELECT pl.id, pl.register_id, pl.slip_id,
+                   SUM(pl.total) OVER (PARTITION BY pl.slip_id, pl.register_id)
+            FROM hr_payslip_line as pl
+            WHERE pl.id in %s
+            ORDER BY pl.contract_id, pl.sequence, pl.id""",
+            (tuple(payslip_lines.ids),),
+        )
+        result = {}
+        register_totals = {}
+        for line_id, register_id, slip_id, register_total in self.env.cr.fetchall():
+            result.setdefault(slip_id, {}).setdefault(register_id, []).append(line_id)
+            register_totals[slip_id, register_id] = register_total
+        register_names = {
+            register["id"]: register["name"]
+            for register in payslip_lines.register_id.read(["name"])
+        }
+        lines_data = self._read_report_lines(
+            payslip_lines, ["name", "code", "quantity", "amount", "total"]
+        )
         for payslip_id, lines_dict in result.items():
-            res.setdefault(payslip_id, [])
-            for register, lines in lines_dict.items():
+            res[payslip_id] = []
+            for register_id, line_ids in lines_dict.items():
                 res[payslip_id].append(
                     {
-                        "register_name": register.name,
-                        "total": sum(lines.mapped("total")),
+                        "register_name": register_names[register_id],
+                        "total": register_totals[payslip_id, register_id],
                     }
                 )
-                for line in lines:
+                for line_id in line_ids:
+                    line = lines_data[line_id]
                     res[payslip_id].append(
                         {
-                            "name": line.name,
-                            "code": line.code,
-                            "quantity": line.quantity,
-                            "amount": line.amount,
-                            "total": line.total,
+                            "name": line["name"],
+                            "code": line["code"],
+                            "quantity": line["quantity"],
+                            "amount": line["amount"],
+                            "total": line["total"],
                         }
                     )
         return res
@@ -101,15 +133,16 @@ class PayslipDetailsReport(models.AbstractModel):
     @api.model
     def _get_report_values(self, docids, data=None):
         payslips = self.env["hr.payslip"].browse(docids)
+        payslip_lines = payslips.line_ids.filtered(lambda r: r.appears_on_payslip)
         return {
             "doc_ids": docids,
             "doc_model": "hr.payslip",
             "docs": payslips,
             "data": data,
             "get_details_by_rule_category": self.get_details_by_rule_category(
-                payslips.mapped("line_ids").filtered(lambda r: r.appears_on_payslip)
+                payslip_lines
             ),
             "get_lines_by_contribution_register": self.get_lines_by_contribution_register(  # noqa: E501
-                payslips.mapped("line_ids").filtered(lambda r: r.appears_on_payslip)
+                payslip_lines
             ),
         }
@@ -0,0 +1,194 @@
+# Part of Odoo. See LICENSE file for full copyright and licensing details.
+
+import json
+import logging
+import os
+import time
+from contextlib import contextmanager
+
+from dateutil.relativedelta import relativedelta
+
+from odoo.fields import Date
+from odoo.tests import tagged
+from odoo.tests.common import TransactionCase
+
+_logger = logging.getLogger(__name__)
+
+BASELINES_PATH = os.path.join(os.path.dirname(__file__), "benchmark_baselines.json")
+
+# Number of employees of each generated dataset, e.g. PAYROLL_BENCHMARK_SIZES=5,50
+BENCHMARK_SIZES = [
+    int(size)
+    for size in os.environ.get("PAYROLL_BENCHMARK_SIZES", "5,20").split(",")
+    if size.strip()
+]
+# Number of salary rules of the generated structure
+BENCHMARK_RULES = int(os.environ.get("PAYROLL_BENCHMARK_RULES", "10"))
+# Allowed query count increase over the baseline, as a ratio
+BENCHMARK_THRESHOLD = float(os.environ.get("PAYROLL_BENCHMARK_THRESHOLD", "0.1"))
+# Set PAYROLL_BENCHMARK_UPDATE=1 to write the measures as the new baselines
+BENCHMARK_UPDATE = os.environ.get("PAYROLL_BENCHMARK_UPDATE") == "1"
+
+
+@tagged("post_install", "-at_install", "-standard", "payroll_benchmark")
+class TestPayrollBenchmark(TransactionCase):
+    """Measure how the cost of the main payroll operations scales with the
+    number of employees, and fail when the query counts regress beyond
+    BENCHMARK_THRESHOLD compared to the JSON baselines."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.results = {}
+        cls.date_from = Date.today().replace(day=1)
+        cls.date_to = cls.date_from + relativedelta(months=1, days=-1)
+        category = cls.env["hr.salary.rule.category"].create(
+            {"name": "Benchmark", "code": "BENCH"}
+        )
+        rules = cls.env["hr.salary.rule"].create(
+            [
+                {
+                    "name": "Benchmark Rule %s" % index,
+                    "code": "BENCH%s" % index,
+                    "sequence": index,
+                    "category_id": category.id,
+                    "condition_select": "none",
+                    "amount_select": "code",
+                    "amount_python_compute": "result = contract.wage / %s"
+                    % BENCHMARK_RULES,
+                }
+                for index in range(BENCHMARK_RULES)
+            ]
+        )
+        cls.structure = cls.env["hr.payroll.structure"].create(
+            {
+                "name": "Benchmark Structure",
+                "code": "BENCH",
+                "company_id": cls.env.company.id,
+                "rule_ids": [(6, 0, rules.ids)],
+            }
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        if BENCHMARK_UPDATE:
+            with open(BASELINES_PATH, "w") as baselines_file:
+                json.dump(cls.results, baselines_file, indent=4, sort_keys=True)
+                baselines_file.write("\n")
+        super().tearDownClass()
+
+    def _create_employees(self, size):
+        """Create `size` employees with a running contract on the structure"""
+        employees = self.env["hr.employee"].create(
+            [{"name": "Benchmark Employee %s" % index} for index in range(size)]
+        )
+        self.env["hr.contract"].create(
+            [
+                {
+                    "name": "Benchmark Contract %s" % employee.name,
+                    "employee_id": employee.id,
+                    "date_start": self.date_from - relativedelta(years=1),
+                    "wage": 5000.0,
+                    "struct_id": self.structure.id,
+                    "state": "open",
+                }
+                for employee in employees
+            ]
+        )
+        return employees
+
+    def _create_payslips(self, employees):
+        payslips = self.env["hr.payslip"].create(
+            [
+                {
+                    "employee_id": employee.id,
+                    "date_from": self.date_from,
+                    "date_to": self.date_to,
+                }
+                for employee in employees
+            ]
+        )
+        payslips.onchange_employee()
+        return payslips
+
+    @contextmanager
+    def _measure(self, operation, size):
+        """Record the duration and the query count of the enclosed block"""
+        self.env.flush_all()
+        self.env.invalidate_all()
+        queries = self.env.cr.sql_log_count
+        start = time.perf_counter()
+        yield
+        self.env.flush_all()
+        measure = {
+            "queries": self.env.cr.sql_log_count - queries,
+            "seconds": round(time.perf_counter() - start, 3),
+        }
+        _logger.info(
+            "Payroll benchmark %s with %s employees: %s queries in %ss",
+            operation,
+            size,
+            measure["queries"],
+            measure["seconds"],
+        )
+        self.results.setdefault(operation, {})[str(size)] = measure
+        self._check_baseline(operation, size, measure)
+
+    def _check_baseline(self, operation, size, measure):
+        if BENCHMARK_UPDATE:
+            return
+        baselines = {}
+        if os.path.exists(BASELINES_PATH):
+            with open(BASELINES_PATH) as baselines_file:
+                baselines = json.load(baselines_file)
+        baseline = baselines.get(operation, {}).get(str(size))
+        if not baseline:
+            self.skipTest(
+                "No payroll benchmark baseline for %s with %s employees, run "
+                "the benchmark once with PAYROLL_BENCHMARK_UPDATE=1 to record it"
+                % (operation, size)
+            )
+        allowed = int(baseline["queries"] * (1 + BENCHMARK_THRESHOLD))
+        self.assertLessEqual(
+            measure["queries"],
+            allowed,
+            "%s with %s employees ran %s queries, the baseline is %s"
+            % (operation, size, measure["queries"], baseline["queries"]),
+        )
+
+    def test_compute_sheet(self):
+        for size in BENCHMARK_SIZES:
+            with self.subTest(size=size):
+                payslips = self._create_payslips(self._create_employees(size))
+                with self._measure("compute_sheet", size):
+                    payslips.compute_sheet()
+                self.assertEqual(
+                    len(payslips.line_ids), size * BENCHMARK_RULES
+                )
+
+    def test_payslip_employees_wizard(self):
+        for size in BENCHMARK_SIZES:
+            with self.subTest(size=size):
+                employees = self._create_employees(size)
+                payslip_run = self.env["hr.payslip.run"].create(
+                    {
+                        "name": "Benchmark Batch %s" % size,
+                        "date_start": self.date_from,
+                        "date_end": self.date_to,
+                    }
+                )
+                wizard = self.env["hr.payslip.employees"].create(
+                    {"employee_ids": [(6, 0, employees.ids)]}
+                )
+                with self._measure("payslip_employees_wizard", size):
+                    wizard.with_context(active_id=payslip_run.id).compute_sheet()
+                self.assertEqual(len(payslip_run.slip_ids), size)
+
+    def test_payslip_confirmation(self):
+        for size in BENCHMARK_SIZES:
+            with self.subTest(size=size):
+                payslips = self._create_payslips(self._create_employees(size))
+                payslips.compute_sheet()
+                with self._measure("payslip_confirmation", size):
+                    payslips.action_payslip_done()
+                self.assertEqual(set(payslips.mapped("state")), {"done"})
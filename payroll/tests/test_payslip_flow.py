@@ -212,6 +212,86 @@ class TestPayslipFlow(TestPayslipBase):
             payslips[1].number, "The second payslip as been assigned a number"
         )
 
+    def test_payslip_details_report_data(self):
+        self.apply_contract_cron()
+        self.categ_alw.parent_id = self.categ_gross
+        self.rule_hra.register_id = self.register_hra
+        payslips = self.Payslip.create(
+            [
+                {"employee_id": self.richard_emp.id},
+                {"employee_id": self.sally.id},
+            ]
+        )
+        payslips.onchange_employee()
+        payslips.compute_sheet()
+        richard_payslip = payslips[0]
+
+        report = self.env["report.payroll.report_payslipdetails"]
+        details = report.get_details_by_rule_category(payslips.line_ids)
+        self.assertEqual(set(details), set(payslips.ids))
+        alw_lines = richard_payslip.line_ids.filtered(
+            lambda line: line.category_id == self.categ_alw
+        )
+        alw_total = sum(alw_lines.mapped("total"))
+        # the allowance category comes with its parent, the root first
+        gross_index = next(
+            index
+            for index, row in enumerate(details[richard_payslip.id])
+            if row["code"] == "GROSS" and row["level"] == 0
+            and details[richard_payslip.id][index + 1]["code"] == "ALW"
+        )
+        gross_row, alw_row = details[richard_payslip.id][gross_index : gross_index + 2]
+        self.assertEqual(alw_row["level"], 1)
+        self.assertAlmostEqual(gross_row["total"], alw_total)
+        self.assertAlmostEqual(alw_row["total"], alw_total)
+        line_rows = details[richard_payslip.id][
+            gross_index + 2 : gross_index + 2 + len(alw_lines)
+        ]
+        self.assertEqual(
+            {row["code"] for row in line_rows}, set(alw_lines.mapped("code"))
+        )
+        self.assertTrue(all(row["level"] == 2 for row in line_rows))
+
+        registers = report.get_lines_by_contribution_register(payslips.line_ids)
+        self.assertEqual(list(registers), richard_payslip.ids)
+        hra_line = richard_payslip.line_ids.filtered(
+            lambda line: line.code == "HRA"
+        )
+        self.assertEqual(
+            registers[richard_payslip.id],
+            [
+                {"register_name": "House Rent Allowance", "total": hra_line.total},
+                {
+                    "name": hra_line.name,
+                    "code": "HRA",
+                    "quantity": hra_line.quantity,
+                    "amount": hra_line.amount,
+                    "total": hra_line.total,
+                },
+            ],
+        )
+
+    def test_contribution_register_report_lines(self):
+        self.apply_contract_cron()
+        self.rule_hra.register_id = self.register_hra
+        payslip = self.Payslip.create({"employee_id": self.richard_emp.id})
+        payslip.onchange_employee()
+        payslip.compute_sheet()
+        payslip.action_payslip_done()
+
+        report = self.env["report.payroll.report_contributionregister"]
+        lines_data, lines_total = report._get_payslip_lines(
+            self.register_hra.ids, payslip.date_from, payslip.date_to
+        )
+        hra_line = payslip.line_ids.filtered(lambda line: line.code == "HRA")
+        self.assertEqual(len(lines_data[self.register_hra.id]), 1)
+        row = lines_data[self.register_hra.id][0]
+        self.assertEqual(row.slip_name, payslip.name)
+        self.assertEqual(row.code, "HRA")
+        self.assertEqual(row.name, hra_line.name)
+        self.assertAlmostEqual(row.total, hra_line.total)
+        self.assertAlmostEqual(lines_total[self.register_hra.id], hra_line.total)
+
     def test_get_contracts_singleton(self):
         payslip = self.Payslip.create({"employee_id": self.sally.id})
         contracts = payslip._get_employee_contracts()
@@ -12,16 +12,45 @@ class HrEmployee(models.Model):
 
     allow_check_from_odoo = fields.Boolean(string="Allow Check From Odoo", default=False, groups="base.group_system,hr.group_hr_user")
 
-    @api.constrains('pin')
+    def init(self):
+        super().init()
+        self.env.cr.execute("""
+            SELECT 1 FROM hr_employee
+             WHERE active AND pin IS NOT NULL AND pin != ''
+          GROUP BY company_id, pin
+            HAVING count(*) > 1
+             LIMIT 1
+        """)
+        if self.env.cr.fetchone():
+            _logger.warning("Duplicate employee PIN codes found, the unique index "
+                            "hr_employee_company_pin_uniq is not created.")
+            return
+        self.env.cr.execute("""
+            CREATE UNIQUE INDEX IF NOT EXISTS hr_employee_company_pin_uniq
+                ON hr_employee (company_id, pin)
+             WHERE active AND pin IS NOT NULL AND pin != ''
+        """)
+
+    @api.constrains('pin', 'company_id', 'active')
     def _check_pin(self):
-        groups = self.read_group(
-            domain=[('pin', '!=', False)],
-            fields=['pin'],
-            groupby=['pin']
-        )
-        for group in groups:
-            if group['pin_count'] > 1:
-                raise UserError(f"PIN Code {group['pin']} must be unique found {group['pin_count']} instances.")
+        employees = self.filtered(lambda employee: employee.active and employee.pin)
+        if not employees:
+            return
+        keys = set()
+        for employee in employees:
+            key = (employee.company_id.id, employee.pin)
+            if key in keys:
+                raise UserError(f"PIN Code {employee.pin} must be unique.")
+            keys.add(key)
+        # compare with the stored values of the other employees only,
+        # the partial unique index guards against concurrent writes
+        self.env.cr.execute("""
+            SELECT company_id, pin FROM hr_employee
+             WHERE active AND pin IN %s AND id NOT IN %s
+        """, (tuple({pin for __, pin in keys}), tuple(employees.ids)))
+        for company_id, pin in self.env.cr.fetchall():
+            if (company_id, pin) in keys:
+                raise UserError(f"PIN Code {pin} must be unique, it is already used by another employee.")
 
     @api.constrains('parent_id')
     def _check_parent_id(self):
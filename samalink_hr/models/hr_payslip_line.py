@@ -4,37 +4,26 @@ from odoo import models
 class HrPayslipLine(models.Model):
     _inherit = 'hr.payslip.line'
 
-    def _compute_related_records_count(self):
-        for line in self:
-            date_from = line.slip_id.date_from
-            date_to = line.slip_id.date_to
-            employee_id = line.slip_id.employee_id
-            if line.salary_rule_id.code not in ['PRESENT_DAYS', 'REST_ALLOW', 'ABSENT_PENALTY']:
-                super(HrPayslipLine, line)._compute_related_records_count()
-            elif line.salary_rule_id.code == 'PRESENT_DAYS':
-                attendance_count = self.env['hr.attendance'].search_count(
-                    [('check_in', '>=', date_from), ('check_in', '<=', date_to),
-                     ('employee_id', '=', employee_id.id)]
-                )
-                line.update({'related_records_count': attendance_count})
-            elif line.salary_rule_id.code == 'REST_ALLOW':
-                from_date_midnight = datetime.combine(date_from, time.min)
-                end_of_to_date = datetime.combine(date_to, time.max)
-                weekend_days = self.env['hr.work.entry'].search_count([
-                    ('employee_id', '=', employee_id.id),
-                    ('date_start', '>=', from_date_midnight),
-                    ('date_stop', '<=', end_of_to_date),
-                    ('work_entry_type_id.code', '=', 'REST100')
-                ])
-                line.update({'related_records_count': weekend_days})
-            elif line.salary_rule_id.code == 'ABSENT_PENALTY':
-                absent_entries_count = self.env['hr.absent.entry'].search_count([
-                     ('employee_id', '=', employee_id.id),
-                     ('date', '>=', date_from),
-                     ('date', '<=', date_to),
-                     ('leave_entry_id', '=', False)
-                ])
-                line.update({'related_records_count': absent_entries_count})
+    def _get_related_records_counters(self):
+        counters = super()._get_related_records_counters()
+        counters.update({
+            'PRESENT_DAYS': '_count_present_days_records',
+            'REST_ALLOW': '_count_rest_allow_records',
+            'ABSENT_PENALTY': '_count_absent_penalty_records',
+        })
+        return counters
+
+    def _count_present_days_records(self):
+        return self._count_related_records('hr.attendance', [], 'employee_id', 'check_in')
+
+    def _count_rest_allow_records(self):
+        return self._count_related_records(
+            'hr.work.entry', [('work_entry_type_id.code', '=', 'REST100')],
+            'employee_id', 'date_start', date_stop_field='date_stop')
+
+    def _count_absent_penalty_records(self):
+        return self._count_related_records(
+            'hr.absent.entry', [('leave_entry_id', '=', False)], 'employee_id', 'date')
 
     def open_related_records(self):
         self.ensure_one()
@@ -8,6 +8,7 @@
     'category': 'Human Resources',
     'depends': ['base', 'hr_holidays', 'samalink_hr'],
     'data': [
+        'security/ir.model.access.csv',
         'views/hr_leave_type.xml',
         'views/hr_leave.xml',
     ],
@@ -1,3 +1,4 @@
 from . import hr_leave_type
+from . import hr_leave_request_counter
 from . import hr_leave
-from . import hr_payslip_line
\ No newline at end of file
+from . import hr_payslip_line
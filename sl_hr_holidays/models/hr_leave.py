@@ -1,12 +1,17 @@
 import logging
-import calendar
 from datetime import timedelta
 from odoo import models, api, fields
 from odoo.exceptions import ValidationError
+from odoo.tools import SQL
 
 logging.basicConfig(level=logging.INFO)
 _logger = logging.getLogger(__name__)
 
+# Fields of the leaves the monthly request counters depend on
+REQUESTS_COUNTER_FIELDS = {'employee_id', 'holiday_status_id', 'request_date_from', 'request_date_to', 'state', 'active'}
+# States of the leaves not counted in the monthly requests limit
+REQUESTS_UNCOUNTED_STATES = ('refuse', 'cancel')
+
 
 class HrLeave(models.Model):
     _inherit = 'hr.leave'
@@ -43,22 +48,94 @@ class HrLeave(models.Model):
             hour_from = hour_to - half_day_hours
         return (hour_from, hour_to)
 
-    @api.constrains('employee_id', 'request_date_from', 'holiday_status_id')
+    @api.constrains('employee_id', 'request_date_from', 'request_date_to', 'holiday_status_id')
     def _check_requests_limit(self):
+        leaves = self.filtered(lambda leave: leave.holiday_status_id.requests_limit > 0
+                               and leave.employee_id and leave.request_date_from)
+        counts = self._sync_requests_counters(leaves._get_requests_counter_keys())
+        leaves._check_requests_counts(counts)
+
+    def _check_requests_counts(self, counts):
         for record in self:
-            if record.holiday_status_id.requests_limit > 0:
-                first_day = record.request_date_from.replace(day=1)
-                last_day = record.request_date_from.replace(day=calendar.monthrange(record.request_date_from.year, record.request_date_from.month)[1])
-                domain = [
-                    ('employee_id', '=', record.employee_id.id),
-                    ('state', 'not in', ['refuse', 'cancel']),
-                    ('request_date_from', '>=', first_day),
-                    ('request_date_to', '<=', last_day),
-                    ('holiday_status_id', '=', record.holiday_status_id.id),
-                ]
-                requests_count = self.search_count(domain)
-                if requests_count > record.holiday_status_id.requests_limit:
-                    raise ValidationError(f"You have reached the maximum number of leave requests ({record.holiday_status_id.requests_limit}) for {record.holiday_status_id.name} in {record.request_date_from.strftime('%B %Y')}.")
+            key = (record.employee_id.id, record.holiday_status_id.id, record.request_date_from.replace(day=1))
+            if counts.get(key, 0) > record.holiday_status_id.requests_limit:
+                raise ValidationError(f"You have reached the maximum number of leave requests ({record.holiday_status_id.requests_limit}) for {record.holiday_status_id.name} in {record.request_date_from.strftime('%B %Y')}.")
+
+    def _get_requests_counter_keys(self):
+        return {
+            (leave.employee_id.id, leave.holiday_status_id.id, leave.request_date_from.replace(day=1))
+            for leave in self
+            if leave.employee_id and leave.holiday_status_id and leave.request_date_from
+        }
+
+    @api.model
+    def _sync_requests_counters(self, keys):
+        """Recount the requests of the given (employee id, leave type id,
+        month) keys, store them in hr.leave.request.counter and return them
+        as {key: count}.
+
+        A month counts the leaves starting in it and ending before its end,
+        which are not refused nor cancelled. All counters are upserted with
+        one query, which locks their rows until the end of the transaction:
+        concurrent requests on the same counter are serialized, the later
+        one being retried and counting the former."""
+        if not keys:
+            return {}
+        self.flush_model(list(REQUESTS_COUNTER_FIELDS))
+        self.env.cr.execute(SQL(
+            """INSERT INTO hr_leave_request_counter (employee_id, holiday_status_id, month, requests_count)
+                    SELECT counter_key.employee_id, counter_key.holiday_status_id, counter_key.month,
+                           COUNT(hr_leave.id)
+                      FROM (VALUES %(keys)s) AS counter_key(employee_id, holiday_status_id, month)
+                 LEFT JOIN hr_leave
+                        ON hr_leave.employee_id = counter_key.employee_id
+                       AND hr_leave.holiday_status_id = counter_key.holiday_status_id
+                       AND hr_leave.request_date_from >= counter_key.month
+                       AND hr_leave.request_date_to < counter_key.month + INTERVAL '1 month'
+                       AND hr_leave.state NOT IN %(uncounted_states)s
+                       AND hr_leave.active
+                  GROUP BY 1, 2, 3
+               ON CONFLICT (employee_id, holiday_status_id, month)
+                 DO UPDATE SET requests_count = EXCLUDED.requests_count
+                 RETURNING employee_id, holiday_status_id, month, requests_count""",
+            keys=SQL(", ").join(
+                SQL("(%s, %s, %s::date)", employee_id, holiday_status_id, month)
+                for employee_id, holiday_status_id, month in keys
+            ),
+            uncounted_states=REQUESTS_UNCOUNTED_STATES,
+        ))
+        self.env['hr.leave.request.counter'].invalidate_model(['requests_count'])
+        return {(employee_id, holiday_status_id, month): count
+                for employee_id, holiday_status_id, month, count in self.env.cr.fetchall()}
+
+    def write(self, vals):
+        """Resync the counters of the months the leaves leave or enter. The
+        limit is only checked again when a refused or cancelled leave is
+        counted again, approving or confirming a counted leave never raises."""
+        limited = self.filtered(lambda leave: leave.holiday_status_id.requests_limit > 0)
+        if not limited or not REQUESTS_COUNTER_FIELDS.intersection(vals):
+            return super().write(vals)
+        old_keys = limited._get_requests_counter_keys()
+        reopened = self.browse()
+        if vals.get('state', 'refuse') not in REQUESTS_UNCOUNTED_STATES:
+            reopened = limited.filtered(lambda leave: leave.state in REQUESTS_UNCOUNTED_STATES
+                                        and leave.employee_id and leave.request_date_from)
+        res = super().write(vals)
+        # the constraint already resynced the new keys of the moved leaves
+        new_keys = limited._get_requests_counter_keys()
+        if 'state' in vals or 'active' in vals:
+            keys = old_keys | new_keys
+        else:
+            keys = old_keys - new_keys
+        counts = self._sync_requests_counters(keys)
+        reopened._check_requests_counts(counts)
+        return res
+
+    def unlink(self):
+        keys = self.filtered(lambda leave: leave.holiday_status_id.requests_limit > 0)._get_requests_counter_keys()
+        res = super().unlink()
+        self._sync_requests_counters(keys)
+        return res
 
     @api.constrains('request_date_from', 'holiday_status_id')
     def _check_request_offset(self):
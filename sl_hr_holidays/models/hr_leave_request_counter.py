@@ -0,0 +1,22 @@
+from odoo import models, fields
+
+
+class HrLeaveRequestCounter(models.Model):
+    """Lock of the leave requests of an employee, leave type and month.
+
+    The limit checks always recount hr_leave while holding the row, so
+    concurrent requests are serialized. requests_count only keeps the
+    last count for reporting and is never read by the checks."""
+    _name = 'hr.leave.request.counter'
+    _description = 'Monthly Leave Requests Counter'
+    _log_access = False
+
+    employee_id = fields.Many2one('hr.employee', required=True, readonly=True, ondelete='cascade')
+    holiday_status_id = fields.Many2one('hr.leave.type', required=True, readonly=True, ondelete='cascade')
+    month = fields.Date(required=True, readonly=True, help="First day of the counted month.")
+    requests_count = fields.Integer(readonly=True, help="Leave requests of the month not refused nor cancelled.")
+
+    _sql_constraints = [
+        ('employee_type_month_uniq', 'unique(employee_id, holiday_status_id, month)',
+         'Only one leave requests counter per employee, leave type and month.'),
+    ]
@@ -8,32 +8,24 @@ _logger = logging.getLogger(__name__)
 class HrPayslipLine(models.Model):
     _inherit = 'hr.payslip.line'
 
-    def _compute_related_records_count(self):
+    def _get_related_records_counters(self):
+        counters = super()._get_related_records_counters()
+        counters['LATE_PENALTY'] = '_count_late_penalty_records'
+        return counters
+
+    def _count_late_penalty_records(self):
+        return self._count_related_records(
+            'hr.attendance', self._get_late_attendance_domain(), 'employee_id', 'check_in')
+
+    def _get_late_attendance_domain(self):
         allowed_late_minutes = self.env['ir.config_parameter'].sudo().get_param('hr_attendance_deviation.allowed_late_minutes', default=30)
         allowed_late_hours = int(allowed_late_minutes) / 60.0
         allowed_early_leaving_minutes = self.env['ir.config_parameter'].sudo().get_param('hr_attendance_deviation.allowed_early_leaving_minutes', default=15)
         allowed_early_leaving_hours = int(allowed_early_leaving_minutes) / 60.0
-        for line in self:
-            if line.salary_rule_id.code != 'LATE_PENALTY':
-                super(HrPayslipLine, line)._compute_related_records_count()
-            else:
-                date_from = line.slip_id.date_from
-                date_to = line.slip_id.date_to
-                employee_id = line.slip_id.employee_id
-                domain = expression.AND([
-                    [('employee_id', '=', employee_id.id)],
-                    [('check_in', '>=', date_from), ('check_in', '<=', date_to)],
-                    ['|', ('late_check_in', '>', allowed_late_hours), ('early_check_out', '>', allowed_early_leaving_hours)],
-                ])
-                attendance_count = self.env['hr.attendance'].search_count(domain)
-                line.update({'related_records_count': attendance_count})
+        return ['|', ('late_check_in', '>', allowed_late_hours), ('early_check_out', '>', allowed_early_leaving_hours)]
 
     def open_related_records(self):
         self.ensure_one()
-        allowed_late_minutes = self.env['ir.config_parameter'].sudo().get_param('hr_attendance_deviation.allowed_late_minutes', default=30)
-        allowed_late_hours = int(allowed_late_minutes) / 60.0
-        allowed_early_leaving_minutes = self.env['ir.config_parameter'].sudo().get_param('hr_attendance_deviation.allowed_early_leaving_minutes', default=15)
-        allowed_early_leaving_hours = int(allowed_early_leaving_minutes) / 60.0
         if self.salary_rule_id.code != 'LATE_PENALTY':
             return super(HrPayslipLine, self).open_related_records()
         else:
@@ -47,7 +39,7 @@ class HrPayslipLine(models.Model):
             action['domain'] = expression.AND([
                 [('employee_id', '=', employee_id.id)],
                 [('check_in', '>=', date_from), ('check_in', '<=', date_to)],
-                ['|', ('late_check_in', '>', allowed_late_hours), ('early_check_out', '>', allowed_early_leaving_hours)],
+                self._get_late_attendance_domain(),
                 # leave_dates_domain
             ])
             return action